@@ -49,9 +49,9 @@ import logging
 import os
 import re
 import sys
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.request import Request, urlopen
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.error import HTTPError
@@ -65,6 +65,8 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 
 WORKSPACE_SUFFIX_PREFIX = "sg-"
+# ASCII digits only, matching validate.py's account ID check
+ACCOUNT_ID_RE = re.compile(r'\A[0-9]{12}\Z')
 
 
 @dataclass
@@ -90,7 +92,7 @@ class WorkspaceRequest:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class PlanAction:
     """A planned action to take."""
     action: str       # create, skip
@@ -99,6 +101,15 @@ class PlanAction:
     reason: str
     details: Dict[str, Any] = field(default_factory=dict)
 
+    def to_dict(self) -> dict:
+        return {
+            "action": self.action,
+            "workspace": self.workspace,
+            "account_id": self.account_id,
+            "reason": self.reason,
+            "details": self.details,
+        }
+
 
 # ---------------------------------------------------------------------------
 # CloudIaC API Client
@@ -266,25 +277,41 @@ class WorkspaceProvisioner:
         self.repository = repository
         self.creds_provider = creds_provider
         self.creds_auth = creds_auth
+        self._accounts: Optional[List[str]] = None
 
     def discover_accounts(self) -> List[str]:
-        """Find all 12-digit account directories under accounts/."""
+        """Find all 12-digit account directories under accounts/.
+
+        The directory is scanned once per provisioner; later calls get a copy
+        of the cached list.
+        """
+        if self._accounts is None:
+            self._accounts = self._scan_accounts()
+        return list(self._accounts)
+
+    def _scan_accounts(self) -> List[str]:
         accounts_dir = self.repo_root / "accounts"
-        if not accounts_dir.exists():
+        try:
+            entries = os.scandir(accounts_dir)
+        except FileNotFoundError:
             return []
-        return sorted([
-            d.name for d in accounts_dir.iterdir()
-            if d.is_dir() and re.match(r'^\d{12}$', d.name)
-            and (d / "security-groups.yaml").exists()
-        ])
+        with entries:
+            # DirEntry.is_dir() uses the type from the directory listing — no extra stat
+            return sorted(
+                e.name for e in entries
+                if ACCOUNT_ID_RE.match(e.name) and e.is_dir()
+                and os.path.isfile(os.path.join(e.path, "security-groups.yaml"))
+            )
 
     def _read_account_env(self, account_id: str) -> str:
         """Read the environment from an account's YAML."""
         import yaml
+        # libyaml-backed loader when PyYAML was built with it
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
         yaml_path = self.repo_root / "accounts" / account_id / "security-groups.yaml"
         try:
-            with open(yaml_path) as f:
-                data = yaml.safe_load(f)
+            with open(yaml_path, "rb") as f:
+                data = yaml.load(f, Loader=loader)
                 return data.get("environment", "dev")
         except Exception:
             return "dev"
@@ -414,9 +441,6 @@ class WorkspaceProvisioner:
         if not actions:
             return []
 
-        # Pre-authenticate so all threads share the cached token
-        self.client.authenticate()
-
         # Split skips (instant) from API calls (threadable)
         skips = [a for a in actions if a.action == "skip"]
         api_actions = [a for a in actions if a.action != "skip"]
@@ -424,6 +448,8 @@ class WorkspaceProvisioner:
         results = [self._execute_action(a) for a in skips]
 
         if api_actions:
+            # Pre-authenticate so all threads share the cached token
+            self.client.authenticate()
             with ThreadPoolExecutor(max_workers=min(max_workers, len(api_actions))) as pool:
                 futures = {pool.submit(self._execute_action, a): a for a in api_actions}
                 for future in as_completed(futures):
@@ -437,6 +463,17 @@ class WorkspaceProvisioner:
 # Output Formatting
 # ---------------------------------------------------------------------------
 
+def _split_actions(actions: List[PlanAction]) -> Tuple[List[PlanAction], List[PlanAction]]:
+    """Partition actions into (creates, skips) in one pass, preserving order."""
+    creates, skips = [], []
+    for a in actions:
+        if a.action == "create":
+            creates.append(a)
+        elif a.action == "skip":
+            skips.append(a)
+    return creates, skips
+
+
 def format_plan_text(actions: List[PlanAction]) -> str:
     """Format plan actions as human-readable text."""
     if not actions:
@@ -444,8 +481,7 @@ def format_plan_text(actions: List[PlanAction]) -> str:
 
     lines = ["📋 CloudIaC Workspace Provisioning Plan", "=" * 50, ""]
 
-    creates = [a for a in actions if a.action == "create"]
-    skips = [a for a in actions if a.action == "skip"]
+    creates, skips = _split_actions(actions)
 
     if creates:
         lines.append(f"🆕 Workspaces to provision: {len(creates)}")
@@ -473,8 +509,7 @@ def format_plan_markdown(actions: List[PlanAction]) -> str:
 
     lines = ["## 📋 CloudIaC Workspace Provisioning Plan", ""]
 
-    creates = [a for a in actions if a.action == "create"]
-    skips = [a for a in actions if a.action == "skip"]
+    creates, skips = _split_actions(actions)
 
     parts = []
     if creates:
@@ -601,7 +636,7 @@ def main():
 
     if args.command == "plan":
         if args.format == "json":
-            print(json.dumps([asdict(a) for a in actions], indent=2))
+            print(json.dumps([a.to_dict() for a in actions], indent=2))
         elif args.format == "markdown":
             print(format_plan_markdown(actions))
         else:
@@ -8,6 +8,10 @@ against schema, guardrails, and naming conventions.
 Usage:
     python validate.py <account_directory_path>
 
+Environment:
+    SG_REPO_ROOT - Repository root containing guardrails.yaml (default: the
+                   nearest ancestor of the account directory that has one)
+
 Exit codes:
     0 - All validations passed
     1 - Validation failures (errors)
@@ -19,14 +23,62 @@ import os
 import re
 import yaml
 import ipaddress
-import argparse
 from typing import Dict, List, Tuple, Any, Optional
 from pathlib import Path
+from types import SimpleNamespace
 from dataclasses import dataclass, field
-import json
+from functools import lru_cache, partial
+from concurrent.futures import ProcessPoolExecutor
+from operator import attrgetter
+
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+# orjson is optional; stdlib json is used when it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _load_yaml(path: Path) -> Any:
+    """Parse a YAML file from a binary handle (no text decoding layer).
+    
+    The loader reads the handle's name, so syntax errors point at the file.
+    """
+    with open(path, 'rb') as f:
+        return yaml.load(f, Loader=_SafeLoader)
+
+
+@lru_cache(maxsize=4096)
+def _parse_network(cidr: str, strict: bool = False):
+    """Parse a CIDR once; the same VPC/corporate ranges repeat across many rules."""
+    return ipaddress.ip_network(cidr, strict=strict)
 
 
-@dataclass
+@lru_cache(maxsize=4096)
+def _parse_cidr_block(cidr: str, is_ipv6: bool) -> Tuple[Any, Optional[str]]:
+    """Parse a rule CIDR for its address family, returning (network, error).
+    
+    Failures are cached too (as the error text) so a bad CIDR repeated across
+    rules is only parsed once.
+    """
+    try:
+        if is_ipv6:
+            return ipaddress.IPv6Network(cidr, strict=False), None
+        return ipaddress.IPv4Network(cidr, strict=False), None
+    except (ipaddress.AddressValueError, ipaddress.NetmaskValueError) as e:
+        return None, str(e)
+
+
+class ValidationException(Exception):
+    """Raised when an account directory can't be validated at all (as opposed to failing validation)"""
+
+
+@dataclass(slots=True)
 class ValidationResult:
     """Represents the result of a validation check"""
     level: str  # 'error', 'warning', 'info'
@@ -34,23 +86,78 @@ class ValidationResult:
     line: Optional[int] = None
     rule: Optional[str] = None
     context: Optional[str] = None
+    _text: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
+    def format_text(self) -> str:
+        """Message with its ' [context]' and ' (rule)' suffixes, formatted once and cached"""
+        if self._text is None:
+            self._text = "".join((
+                self.message,
+                f" [{self.context}]" if self.context else "",
+                f" ({self.rule})" if self.rule else "",
+            ))
+        return self._text
+
+
+# JSON output field order for a ValidationResult
+_RESULT_KEYS = ('level', 'message', 'rule', 'context', 'line')
+_get_result_fields = attrgetter(*_RESULT_KEYS)
+
 
+def _result_to_dict(result: ValidationResult) -> Dict[str, Any]:
+    """Convert a ValidationResult into its JSON output dict"""
+    return dict(zip(_RESULT_KEYS, _get_result_fields(result)))
 
-@dataclass
+
+def _group_by_rule(results: List[ValidationResult]) -> Dict[Optional[str], List[ValidationResult]]:
+    """Bucket results by rule in a single pass"""
+    groups: Dict[Optional[str], List[ValidationResult]] = {}
+    for result in results:
+        bucket = groups.get(result.rule)
+        if bucket is None:
+            groups[result.rule] = [result]
+        else:
+            bucket.append(result)
+    return groups
+
+
+@dataclass(slots=True)
 class ValidationSummary:
     """Summary of all validation results"""
     errors: List[ValidationResult] = field(default_factory=list)
     warnings: List[ValidationResult] = field(default_factory=list)
     info: List[ValidationResult] = field(default_factory=list)
+    # When False, warning-level results are dropped as they are reported
+    record_warnings: bool = True
     
     def add_result(self, result: ValidationResult):
         if result.level == 'error':
             self.errors.append(result)
         elif result.level == 'warning':
-            self.warnings.append(result)
+            if self.record_warnings:
+                self.warnings.append(result)
         else:
             self.info.append(result)
     
+    def emit(self, level: str, rule: str, context: Optional[str], fmt: str, *args):
+        """Record a result from a %-style message template.
+        
+        The message is only formatted here, once the result is being recorded;
+        with no args the template is used as-is.
+        """
+        if level == 'warning' and not self.record_warnings:
+            return
+        self.add_result(ValidationResult(
+            level=level,
+            message=fmt % args if args else fmt,
+            rule=rule,
+            context=context
+        ))
+    
+    def add_errors(self, results: List[ValidationResult]):
+        """Append a batch of error-level results without per-result dispatch"""
+        self.errors.extend(results)
+    
     @property
     def has_errors(self) -> bool:
         return len(self.errors) > 0
@@ -59,6 +166,16 @@ class ValidationSummary:
     def has_warnings(self) -> bool:
         return len(self.warnings) > 0
     
+    @property
+    def errors_by_rule(self) -> Dict[Optional[str], List[ValidationResult]]:
+        """Errors grouped by rule, in report order"""
+        return _group_by_rule(self.errors)
+    
+    @property
+    def warnings_by_rule(self) -> Dict[Optional[str], List[ValidationResult]]:
+        """Warnings grouped by rule, in report order"""
+        return _group_by_rule(self.warnings)
+    
     def get_exit_code(self) -> int:
         if self.has_errors:
             return 1
@@ -70,6 +187,35 @@ class ValidationSummary:
 class SecurityGroupValidator:
     """Main validator for AWS Security Groups YAML configuration"""
     
+    # Why a blocked port is dangerous and what to use instead: port -> (reason, suggestion)
+    BLOCKED_PORT_REASONS = {
+        135: ("commonly exploited for lateral movement attacks. Not needed for cloud workloads",
+              "Remove this rule. If you need Windows RPC, contact the security team."),
+        139: ("commonly exploited for lateral movement attacks. Not needed for cloud workloads",
+              "Remove this rule. If you need Windows RPC, contact the security team."),
+        23: ("transmits data in plain text, easily intercepted by attackers",
+             "Use SSH (port 22) or AWS Systems Manager Session Manager instead."),
+        3389: ("commonly brute-forced and vulnerable to exploits",
+               "Use AWS Systems Manager Session Manager for Windows access."),
+        21: ("insecure protocols that transmit credentials in plain text",
+             "Use secure alternatives (SFTP, encrypted email protocols)."),
+        25: ("insecure protocols that transmit credentials in plain text",
+             "Use secure alternatives (SFTP, encrypted email protocols)."),
+    }
+    DEFAULT_BLOCKED_PORT_REASON = ("blocked for security reasons",
+                                   "Remove this rule or contact the security team if required.")
+    
+    # Ports that should not be reachable from a CIDR source: (port, warning), in report order
+    CIDR_SENSITIVE_PORTS = (
+        (22, "⚠️ HIGH: SSH (port 22) ingress from CIDR — any host in that range gets SSH access. PCI DSS Req 1.3.2"),
+        (3389, "⚠️ HIGH: RDP (port 3389) ingress from CIDR — any host in that range gets RDP access. PCI DSS Req 1.3.2"),
+    ) + tuple(
+        (port, f"⚠️ HIGH: {name} (port {port}) ingress from CIDR — CIDR-based database access is a common audit finding. PCI DSS Req 1.3.1")
+        for port, name in ((3306, 'MySQL'), (5432, 'PostgreSQL'), (1433, 'MSSQL'), (27017, 'MongoDB'), (6379, 'Redis'))
+    )
+    # RFC 1918 supernets that are too broad for an ingress source
+    BROAD_INTERNAL_CIDRS = frozenset({'10.0.0.0/8', '172.16.0.0/12', '192.168.0.0/16'})
+    
     # Port name mapping for blocked/warning ports
     PORT_NAMES = {
         23: "Telnet",
@@ -94,12 +240,72 @@ class SecurityGroupValidator:
         995: "POP3S"
     }
     
-    def __init__(self, account_dir: str):
+    # path -> ((mtime_ns, size, inode), parsed guardrails / prefix-list YAML), shared by all instances
+    _CONFIG_CACHE: Dict[Path, Tuple[Tuple[int, int, int], Any]] = {}
+    
+    def __init__(self, account_dir: str, record_warnings: bool = True):
         self.account_dir = Path(account_dir).resolve()
+        self.record_warnings = record_warnings
         self.repo_root = self._find_repo_root()
-        self.guardrails = self._load_guardrails()
-        self.prefix_lists = self._load_prefix_lists()
+        self._dir_is_account_id = self._is_account_id(self.account_dir.name)
         self.account_id = self._extract_account_id()
+        self._configure(self._load_guardrails(), self._load_prefix_lists())
+    
+    @classmethod
+    def from_dicts(cls, account_id: str, guardrails: Dict[str, Any],
+                   prefix_lists: Optional[Dict[str, Any]] = None,
+                   record_warnings: bool = True) -> 'SecurityGroupValidator':
+        """Build a validator from already-parsed config, without touching the filesystem.
+        
+        The account is treated as living in a directory named after account_id.
+        Use validate_data() to check an in-memory security-groups document.
+        """
+        self = cls.__new__(cls)
+        self.account_dir = Path(account_id)
+        self.record_warnings = record_warnings
+        self.repo_root = None
+        self._dir_is_account_id = cls._is_account_id(account_id)
+        self.account_id = account_id
+        self._configure(guardrails, prefix_lists)
+        return self
+    
+    def _configure(self, guardrails: Dict[str, Any], prefix_lists: Optional[Dict[str, Any]]):
+        """Set the guardrail-derived state used by every check"""
+        self.guardrails = guardrails
+        self.prefix_lists = prefix_lists
+        self._defined_prefix_lists = frozenset((prefix_lists or {}).get('prefix_lists') or ())
+        
+        # Resolve guardrail settings once instead of per security group / rule
+        validation = self.guardrails.get('validation', {})
+        rule_limits = validation.get('rules', {})
+        naming = validation.get('naming', {})
+        port_ranges = validation.get('port_ranges', {})
+        self._max_ingress = rule_limits.get('max_ingress_rules', 60)
+        self._max_egress = rule_limits.get('max_egress_rules', 60)
+        self._required_tags = tuple(naming.get('required_tags', []))
+        self._blocked_cidrs = frozenset(c for c in validation.get('blocked_cidrs', []) if isinstance(c, str))
+        # (port, message) pairs, ascending so blocked-port errors come out in port order
+        self._blocked_ports = tuple(
+            (port, self._MSG_BLOCKED_PORT % ((self._get_port_description(port),)
+                                             + self.BLOCKED_PORT_REASONS.get(port, self.DEFAULT_BLOCKED_PORT_REASON)))
+            for port in sorted({p for p in validation.get('blocked_ports', []) if isinstance(p, int)})
+        )
+        self._max_port_range = port_ranges.get('max_range_size', 1000)
+        self._max_name_length = naming.get('max_name_length', 63)
+        # Names must be ASCII anyway (see _check_printable), so match without Unicode tables
+        # unless the guardrails opt out
+        self._sg_name_re = re.compile(naming.get('security_group_pattern', r'^[a-z0-9][a-z0-9-]*[a-z0-9]$'),
+                                      re.ASCII if naming.get('ascii_only', True) else 0)
+        
+        # id(list) -> sorted tuple; only valid while the parsed document is alive
+        self._sort_cache: Dict[int, tuple] = {}
+        # Named prefix lists referenced by rules, collected during the SG walk
+        self._referenced_prefix_lists: set = set()
+    
+    @staticmethod
+    def _is_account_id(value: str) -> bool:
+        """Return True if value is a 12-digit AWS account ID"""
+        return len(value) == 12 and value.isascii() and value.isdigit()
     
     def _get_port_description(self, port: int) -> str:
         """Get human-readable port description"""
@@ -109,21 +315,42 @@ class SecurityGroupValidator:
         
     def _find_repo_root(self) -> Path:
         """Find the repository root by looking for guardrails.yaml"""
+        repo_root = os.environ.get('SG_REPO_ROOT')
+        if repo_root:
+            return Path(repo_root).resolve()
         current = self.account_dir
         while current != current.parent:
-            if (current / "guardrails.yaml").exists():
+            if os.path.isfile(os.path.join(current, "guardrails.yaml")):
                 return current
             current = current.parent
         raise FileNotFoundError("Could not find repository root with guardrails.yaml")
     
+    @classmethod
+    def _load_config_yaml(cls, path: Path) -> Any:
+        """Parse a repo-level config file, reusing the parsed data while the file is unchanged.
+        
+        Validators for several accounts in one process share the same guardrails
+        and prefix-list files; the result is shared too, so treat it as read-only.
+        """
+        st = path.stat()
+        stat_key = (st.st_mtime_ns, st.st_size, st.st_ino)
+        cached = cls._CONFIG_CACHE.get(path)
+        if cached is not None and cached[0] == stat_key:
+            return cached[1]
+        data = _load_yaml(path)
+        cls._CONFIG_CACHE[path] = (stat_key, data)
+        return data
+    
     def _load_guardrails(self) -> Dict[str, Any]:
         """Load guardrails configuration from repo root"""
         guardrails_path = self.repo_root / "guardrails.yaml"
         try:
-            with open(guardrails_path, 'r') as f:
-                return yaml.safe_load(f)
+            guardrails = self._load_config_yaml(guardrails_path)
         except Exception as e:
             raise FileNotFoundError(f"Failed to load guardrails.yaml: {e}")
+        if not isinstance(guardrails, dict):
+            raise ValidationException("guardrails.yaml must be a mapping")
+        return guardrails
     
     def _load_prefix_lists(self) -> Dict[str, Any]:
         """Load known prefix list names from allowlist"""
@@ -133,14 +360,12 @@ class SecurityGroupValidator:
         
         try:
             if allowlist_path.exists():
-                with open(allowlist_path, 'r') as f:
-                    data = yaml.safe_load(f)
+                data = self._load_config_yaml(allowlist_path)
                 # Convert list to dict keys for backward compat with validation checks
                 names = data.get('known_prefix_lists', [])
                 return {"prefix_lists": {name: {} for name in names}}
             elif legacy_path.exists():
-                with open(legacy_path, 'r') as f:
-                    return yaml.safe_load(f)
+                return self._load_config_yaml(legacy_path)
             else:
                 return {"prefix_lists": {}}
         except Exception as e:
@@ -150,25 +375,24 @@ class SecurityGroupValidator:
         """Extract account ID from the directory path"""
         # Account directories should be named with 12-digit account IDs
         account_dir_name = self.account_dir.name
-        if re.match(r'^\d{12}$', account_dir_name):
+        if self._dir_is_account_id:
             return account_dir_name
         
         # If directory name isn't an account ID, look for it in the YAML
         security_groups_file = self.account_dir / "security-groups.yaml"
         if security_groups_file.exists():
             try:
-                with open(security_groups_file, 'r') as f:
-                    data = yaml.safe_load(f)
-                    if data and 'account_id' in data:
-                        return data['account_id']
+                data = _load_yaml(security_groups_file)
+                if data and 'account_id' in data:
+                    return data['account_id']
             except:
                 pass
         
-        raise ValueError(f"Could not determine account ID from directory '{account_dir_name}'")
+        raise ValidationException(f"Could not determine account ID from directory '{account_dir_name}'")
     
     def validate(self) -> ValidationSummary:
         """Main validation method - performs all checks"""
-        summary = ValidationSummary()
+        summary = ValidationSummary(record_warnings=self.record_warnings)
         
         # Check if security-groups.yaml exists
         sg_file = self.account_dir / "security-groups.yaml"
@@ -182,8 +406,7 @@ class SecurityGroupValidator:
         
         # Load and parse YAML
         try:
-            with open(sg_file, 'r') as f:
-                data = yaml.safe_load(f)
+            data = _load_yaml(sg_file)
         except yaml.YAMLError as e:
             summary.add_result(ValidationResult(
                 level='error',
@@ -192,6 +415,14 @@ class SecurityGroupValidator:
             ))
             return summary
         
+        return self.validate_data(data, summary)
+    
+    def validate_data(self, data: Any, summary: Optional[ValidationSummary] = None) -> ValidationSummary:
+        """Validate an already-parsed security-groups.yaml document"""
+        if summary is None:
+            summary = ValidationSummary(record_warnings=self.record_warnings)
+        self._sort_cache.clear()
+        
         if not data:
             summary.add_result(ValidationResult(
                 level='error',
@@ -200,28 +431,65 @@ class SecurityGroupValidator:
             ))
             return summary
         
-        # Perform all validation checks
-        self._validate_schema(data, summary)
+        if not isinstance(data, dict):
+            summary.add_result(ValidationResult(
+                level='error',
+                message=f"security-groups.yaml must be a mapping of keys, got {type(data).__name__}",
+                rule='schema_type'
+            ))
+            return summary
+        
+        # Perform all validation checks; the SG walk only runs on a usable structure
+        can_walk_security_groups = self._validate_schema(data, summary)
         self._validate_account_id(data, summary)
-        self._validate_security_groups(data, summary)
-        self._validate_naming_conventions(data, summary)
-        self._validate_prefix_list_references(data, summary)
-        self._validate_unicode_characters(data, summary)
+        if can_walk_security_groups:
+            self._validate_security_groups(data, summary)
         
         return summary
     
     # Known top-level keys in security-groups.yaml
-    KNOWN_TOP_LEVEL_KEYS = {'account_id', 'environment', 'security_groups', 'tags'}
+    KNOWN_TOP_LEVEL_KEYS = frozenset({'account_id', 'environment', 'security_groups', 'tags'})
     # Known keys within a security group definition
-    KNOWN_SG_KEYS = {'description', 'ingress', 'egress', 'tags'}
+    KNOWN_SG_KEYS = frozenset({'description', 'ingress', 'egress', 'tags'})
     # Known keys within a rule definition
-    KNOWN_RULE_KEYS = {'protocol', 'from_port', 'to_port', 'cidr_blocks', 'ipv6_cidr_blocks',
-                       'security_groups', 'prefix_list_ids', 'self', 'description'}
+    KNOWN_RULE_KEYS = frozenset({'protocol', 'from_port', 'to_port', 'cidr_blocks', 'ipv6_cidr_blocks',
+                                 'security_groups', 'prefix_list_ids', 'self', 'description'})
     # Valid environments
     VALID_ENVIRONMENTS = {'prod', 'test', 'dev'}
+    # Anything outside string.printable (ASCII 0x20-0x7E plus standard whitespace)
+    NON_PRINTABLE_RE = re.compile(r'[^\x20-\x7e\t\n\r\x0b\x0c]')
+    # Name prefixes reserved for AWS / platform-managed security groups
+    RESERVED_NAME_PREFIXES = ('default', 'baseline', 'aws-', 'amazon-')
+    RESERVED_NAME_RE = re.compile('(' + '|'.join(map(re.escape, RESERVED_NAME_PREFIXES)) + ')')
+    # Security group reference: an SG ID or a name defined in this repo
+    SG_REF_RE = re.compile(r'^(sg-[0-9a-f]{8,17}|[A-Za-z0-9][A-Za-z0-9_-]*)$')
+    # Rule keys that name a source/destination (at least one is required)
+    SOURCE_FIELDS = frozenset({'cidr_blocks', 'ipv6_cidr_blocks', 'security_groups', 'self', 'prefix_list_ids'})
+    # Named protocols accepted in rules (numeric protocols 0-255 are also allowed)
+    VALID_PROTOCOLS = frozenset({'tcp', 'udp', 'icmp', 'icmpv6', 'ah', 'esp', 'gre', 'all', '-1'})
+    
+    # Message templates for errors that repeat per security group / rule
+    _MSG_MISSING_TAG = (
+        "❌ Missing required tag '%s' — all security groups must include corporate mandatory tags for compliance tracking.\n"
+        "   → Required tags: <company>-app-env, <company>-data-classification, <company>-app-carid, <company>-ops-supportgroup, <company>-app-supportgroup, <company>-provisioner-repo, <company>-iam-access-control, <company>-provisioner-workspace"
+    )
+    _MSG_RULE_COUNT = (
+        "❌ Security group '%s' has %d %s rules, maximum is %s — too many rules make security groups hard to manage and can impact performance.\n"
+        "   → Consolidate similar rules or split into multiple security groups by function."
+    )
+    _MSG_BLOCKED_PORT = "❌ Port %s is blocked — %s.\n   → %s"
+    _MSG_PORT_RANGE_TOO_LARGE = (
+        "❌ Port range %d-%d is too broad (%d ports, max %s) — this effectively opens all ports.\n"
+        "   → Narrow to specific ports your application needs (e.g., 443, 8080).\n"
+        "   → EKS node communication is handled by baseline profiles via AFT — not this repo."
+    )
 
-    def _validate_schema(self, data: Dict[str, Any], summary: ValidationSummary):
-        """Validate basic YAML schema structure"""
+    def _validate_schema(self, data: Dict[str, Any], summary: ValidationSummary) -> bool:
+        """Validate basic YAML schema structure.
+        
+        Returns False when security_groups is missing or not a mapping, in which
+        case the per-SG checks are skipped rather than cascading.
+        """
         required_fields = ['account_id', 'security_groups']
         
         for field in required_fields:
@@ -233,13 +501,14 @@ class SecurityGroupValidator:
                 ))
         
         # Check for unknown top-level keys (typo detection)
-        unknown_keys = set(data.keys()) - self.KNOWN_TOP_LEVEL_KEYS
-        for key in sorted(unknown_keys):
-            summary.add_result(ValidationResult(
+        summary.add_errors([
+            ValidationResult(
                 level='error',
                 message=f"❌ Unknown top-level key '{key}' — did you mean one of: {', '.join(sorted(self.KNOWN_TOP_LEVEL_KEYS))}?\n   → Typos in key names are silently ignored and your config won't apply.",
                 rule='schema_unknown_key'
-            ))
+            )
+            for key in sorted(k for k in data if k not in self.KNOWN_TOP_LEVEL_KEYS)
+        ])
         
         # Validate environment field
         if 'environment' in data:
@@ -257,41 +526,18 @@ class SecurityGroupValidator:
                     rule='schema_invalid_environment'
                 ))
         
-        if 'security_groups' in data:
-            if not isinstance(data['security_groups'], dict):
-                summary.add_result(ValidationResult(
-                    level='error',
-                    message="'security_groups' must be a dictionary/object",
-                    rule='schema_type'
-                ))
-            else:
-                # Validate unknown keys within each security group
-                for sg_name, sg_config in data['security_groups'].items():
-                    if not isinstance(sg_config, dict):
-                        continue
-                    unknown_sg_keys = set(sg_config.keys()) - self.KNOWN_SG_KEYS
-                    for key in sorted(unknown_sg_keys):
-                        summary.add_result(ValidationResult(
-                            level='error',
-                            message=f"❌ Unknown key '{key}' in security group '{sg_name}' — valid keys: {', '.join(sorted(self.KNOWN_SG_KEYS))}\n   → Typos are silently ignored. Check spelling.",
-                            rule='schema_unknown_sg_key',
-                            context=f"security_group.{sg_name}"
-                        ))
-                    
-                    # Validate unknown keys within each rule
-                    for rule_type in ['ingress', 'egress']:
-                        if rule_type in sg_config and isinstance(sg_config[rule_type], list):
-                            for i, rule in enumerate(sg_config[rule_type]):
-                                if not isinstance(rule, dict):
-                                    continue
-                                unknown_rule_keys = set(rule.keys()) - self.KNOWN_RULE_KEYS
-                                for key in sorted(unknown_rule_keys):
-                                    summary.add_result(ValidationResult(
-                                        level='error',
-                                        message=f"❌ Unknown key '{key}' in {sg_name} {rule_type}[{i}] — valid keys: {', '.join(sorted(self.KNOWN_RULE_KEYS))}\n   → This key will be ignored. Check spelling.",
-                                        rule='schema_unknown_rule_key',
-                                        context=f"security_group.{sg_name}.{rule_type}[{i}]"
-                                    ))
+        # Unknown keys inside security groups and rules are reported during the
+        # per-SG walk (_validate_security_group / _validate_security_group_rule)
+        if 'security_groups' not in data:
+            return False
+        if not isinstance(data['security_groups'], dict):
+            summary.add_result(ValidationResult(
+                level='error',
+                message="'security_groups' must be a dictionary/object",
+                rule='schema_type'
+            ))
+            return False
+        return True
     
     def _validate_account_id(self, data: Dict[str, Any], summary: ValidationSummary):
         """Validate account ID format and consistency"""
@@ -301,7 +547,7 @@ class SecurityGroupValidator:
         account_id = str(data['account_id'])
         
         # Must be 12-digit string
-        if not re.match(r'^\d{12}$', account_id):
+        if not self._is_account_id(account_id):
             summary.add_result(ValidationResult(
                 level='error',
                 message=f"account_id must be a 12-digit string, got '{account_id}'",
@@ -309,7 +555,7 @@ class SecurityGroupValidator:
             ))
         
         # Should match directory name if directory is account ID
-        if re.match(r'^\d{12}$', self.account_dir.name) and account_id != self.account_dir.name:
+        if self._dir_is_account_id and account_id != self.account_dir.name:
             summary.add_result(ValidationResult(
                 level='warning',
                 message=f"account_id '{account_id}' doesn't match directory name '{self.account_dir.name}'",
@@ -317,44 +563,49 @@ class SecurityGroupValidator:
             ))
     
     def _validate_security_groups(self, data: Dict[str, Any], summary: ValidationSummary):
-        """Validate individual security groups"""
-        if 'security_groups' not in data or not data['security_groups']:
-            return
-        if not isinstance(data['security_groups'], dict):
-            return  # already caught by schema validation
+        """Validate individual security groups.
         
+        This is the single walk over security_groups: naming, structure, tags,
+        rules and character checks for each SG (and each of its rules) all run
+        from here rather than in separate passes over the config.
+        """
+        security_groups = data['security_groups']
         top_level_env = data.get('environment', '')
-        for sg_name, sg_config in data['security_groups'].items():
-            self._validate_security_group(sg_name, sg_config, summary, top_level_env=top_level_env)
+        self._referenced_prefix_lists = set()
+        for sg_name, sg_config in security_groups.items():
+            context = f"security_group.{sg_name}"
+            self._validate_security_group_name(sg_name, summary, context=context)
+            self._validate_security_group(sg_name, sg_config, summary, top_level_env=top_level_env, context=context)
+        
+        self._validate_prefix_list_references(summary)
     
     def _safe_sort_tuple(self, val) -> tuple:
         """Safely convert a field to a sorted tuple for hashing, handling type errors."""
         if isinstance(val, list):
+            if not val:
+                return ()
+            if len(val) == 1:
+                return (str(val[0]),)
+            # YAML anchors/aliases hand us the same list object many times
+            cached = self._sort_cache.get(id(val))
+            if cached is not None:
+                return cached
             try:
-                return tuple(sorted(str(v) for v in val))
+                result = tuple(sorted(str(v) for v in val))
             except TypeError:
-                return (str(val),)
+                result = (str(val),)
+            self._sort_cache[id(val)] = result
+            return result
         elif val is None:
             return ()
         else:
             return (str(val),)
 
-    def _normalize_rule(self, rule: Dict[str, Any]) -> tuple:
-        """Create a hashable representation of a rule for duplicate detection"""
-        return (
-            rule.get('protocol'),
-            rule.get('from_port'),
-            rule.get('to_port'),
-            self._safe_sort_tuple(rule.get('cidr_blocks', [])),
-            self._safe_sort_tuple(rule.get('ipv6_cidr_blocks', [])),
-            self._safe_sort_tuple(rule.get('security_groups', [])),
-            self._safe_sort_tuple(rule.get('prefix_list_ids', [])),
-            rule.get('self', False),
-        )
-
-    def _validate_security_group(self, sg_name: str, sg_config: Dict[str, Any], summary: ValidationSummary, top_level_env: str = ""):
+    def _validate_security_group(self, sg_name: str, sg_config: Dict[str, Any], summary: ValidationSummary,
+                                 top_level_env: str = "", context: Optional[str] = None):
         """Validate a single security group configuration"""
-        context = f"security_group.{sg_name}"
+        if context is None:
+            context = f"security_group.{sg_name}"
         
         if not isinstance(sg_config, dict):
             summary.add_result(ValidationResult(
@@ -365,6 +616,17 @@ class SecurityGroupValidator:
             ))
             return
         
+        # Check for unknown keys (typo detection)
+        summary.add_errors([
+            ValidationResult(
+                level='error',
+                message=f"❌ Unknown key '{key}' in security group '{sg_name}' — valid keys: {', '.join(sorted(self.KNOWN_SG_KEYS))}\n   → Typos are silently ignored. Check spelling.",
+                rule='schema_unknown_sg_key',
+                context=context
+            )
+            for key in sorted(k for k in sg_config if k not in self.KNOWN_SG_KEYS)
+        ])
+        
         # Required fields
         if 'description' not in sg_config or not sg_config['description'].strip():
             summary.add_result(ValidationResult(
@@ -373,11 +635,16 @@ class SecurityGroupValidator:
                 rule='sg_required_description',
                 context=context
             ))
+        if isinstance(sg_config.get('description'), str):
+            self._check_printable(sg_config['description'], summary, "%s.description", context)
+        
+        ingress = sg_config.get('ingress')
+        egress = sg_config.get('egress')
         
         # Validate ingress rules
         if 'ingress' in sg_config:
-            if isinstance(sg_config['ingress'], list):
-                if len(sg_config['ingress']) == 0:
+            if isinstance(ingress, list):
+                if not ingress:
                     summary.add_result(ValidationResult(
                         level='warning',
                         message=f"⚠️ Security group '{sg_name}' has an empty ingress list — remove it or add rules.",
@@ -385,10 +652,10 @@ class SecurityGroupValidator:
                         context=context
                     ))
                 else:
-                    for i, rule in enumerate(sg_config['ingress']):
+                    for i, rule in enumerate(ingress):
                         self._validate_security_group_rule(sg_name, 'ingress', i, rule, summary)
-                    self._check_duplicate_rules(sg_name, 'ingress', sg_config['ingress'], summary)
-                    self._check_shadowed_rules(sg_name, 'ingress', sg_config['ingress'], summary)
+                    self._check_duplicate_rules(sg_name, 'ingress', ingress, summary)
+                    self._check_shadowed_rules(sg_name, 'ingress', ingress, summary)
             else:
                 summary.add_result(ValidationResult(
                     level='error',
@@ -399,8 +666,8 @@ class SecurityGroupValidator:
         
         # Validate egress rules
         if 'egress' in sg_config:
-            if isinstance(sg_config['egress'], list):
-                if len(sg_config['egress']) == 0:
+            if isinstance(egress, list):
+                if not egress:
                     summary.add_result(ValidationResult(
                         level='warning',
                         message=f"⚠️ Security group '{sg_name}' has an empty egress list — remove it or add rules.",
@@ -408,10 +675,10 @@ class SecurityGroupValidator:
                         context=context
                     ))
                 else:
-                    for i, rule in enumerate(sg_config['egress']):
+                    for i, rule in enumerate(egress):
                         self._validate_security_group_rule(sg_name, 'egress', i, rule, summary)
-                    self._check_duplicate_rules(sg_name, 'egress', sg_config['egress'], summary)
-                    self._check_shadowed_rules(sg_name, 'egress', sg_config['egress'], summary)
+                    self._check_duplicate_rules(sg_name, 'egress', egress, summary)
+                    self._check_shadowed_rules(sg_name, 'egress', egress, summary)
             else:
                 summary.add_result(ValidationResult(
                     level='error',
@@ -420,43 +687,50 @@ class SecurityGroupValidator:
                     context=context
                 ))
         
-        # Check rule count limits
-        total_ingress = len(sg_config.get('ingress', []))
-        total_egress = len(sg_config.get('egress', []))
-        max_ingress = self.guardrails.get('validation', {}).get('rules', {}).get('max_ingress_rules', 60)
-        max_egress = self.guardrails.get('validation', {}).get('rules', {}).get('max_egress_rules', 60)
-        
-        if total_ingress > max_ingress:
-            summary.add_result(ValidationResult(
-                level='error',
-                message=f"❌ Security group '{sg_name}' has {total_ingress} ingress rules, maximum is {max_ingress} — too many rules make security groups hard to manage and can impact performance.\n   → Consolidate similar rules or split into multiple security groups by function.",
-                rule='sg_rule_count_limit',
-                context=context
-            ))
-        
-        if total_egress > max_egress:
-            summary.add_result(ValidationResult(
-                level='error',
-                message=f"❌ Security group '{sg_name}' has {total_egress} egress rules, maximum is {max_egress} — too many rules make security groups hard to manage and can impact performance.\n   → Consolidate similar rules or split into multiple security groups by function.",
-                rule='sg_rule_count_limit',
-                context=context
-            ))
-        
-        # Check for required tags
-        required_tags = self.guardrails.get('validation', {}).get('naming', {}).get('required_tags', [])
-        sg_tags = sg_config.get('tags', {})
-        
-        for required_tag in required_tags:
-            if required_tag not in sg_tags:
-                message = (f"❌ Missing required tag '{required_tag}' — all security groups must include corporate mandatory tags for compliance tracking.\n"
-                          f"   → Required tags: <company>-app-env, <company>-data-classification, <company>-app-carid, <company>-ops-supportgroup, <company>-app-supportgroup, <company>-provisioner-repo, <company>-iam-access-control, <company>-provisioner-workspace")
+        # Check rule count limits (nothing to count for SGs without rules)
+        if ingress or egress:
+            total_ingress = len(ingress) if isinstance(ingress, list) else 0
+            total_egress = len(egress) if isinstance(egress, list) else 0
+            max_ingress = self._max_ingress
+            max_egress = self._max_egress
+            
+            if total_ingress > max_ingress:
                 summary.add_result(ValidationResult(
                     level='error',
-                    message=message,
-                    rule='sg_required_tags',
+                    message=self._MSG_RULE_COUNT % (sg_name, total_ingress, 'ingress', max_ingress),
+                    rule='sg_rule_count_limit',
+                    context=context
+                ))
+            
+            if total_egress > max_egress:
+                summary.add_result(ValidationResult(
+                    level='error',
+                    message=self._MSG_RULE_COUNT % (sg_name, total_egress, 'egress', max_egress),
+                    rule='sg_rule_count_limit',
                     context=context
                 ))
         
+        # Check for required tags
+        sg_tags = sg_config.get('tags', {})
+        
+        if isinstance(sg_tags, dict):
+            for tag_key, tag_value in sg_tags.items():
+                if isinstance(tag_key, str):
+                    self._check_printable(tag_key, summary, "%s.tags.key.%s", context, tag_key)
+                if isinstance(tag_value, str):
+                    self._check_printable(tag_value, summary, "%s.tags.value.%s", context, tag_key)
+        
+        summary.add_errors([
+            ValidationResult(
+                level='error',
+                message=self._MSG_MISSING_TAG % required_tag,
+                rule='sg_required_tags',
+                context=context
+            )
+            for required_tag in self._required_tags
+            if required_tag not in sg_tags
+        ])
+        
         # Validate <company>-app-env tag matches top-level environment
         app_env_tag = sg_tags.get('<company>-app-env', '')
         if top_level_env and app_env_tag and app_env_tag != top_level_env:
@@ -587,13 +861,13 @@ class SecurityGroupValidator:
     def _cidr_covered_by_any(self, narrow_cidr: str, broad_cidrs: list) -> bool:
         """Check if a CIDR is a subnet of any CIDR in the broad list."""
         try:
-            narrow_net = ipaddress.ip_network(narrow_cidr, strict=False)
+            narrow_net = _parse_network(narrow_cidr)
         except (ValueError, TypeError):
             return False
         
         for b_cidr in broad_cidrs:
             try:
-                broad_net = ipaddress.ip_network(b_cidr, strict=False)
+                broad_net = _parse_network(b_cidr)
                 if narrow_net.subnet_of(broad_net):
                     return True
             except (ValueError, TypeError):
@@ -635,26 +909,64 @@ class SecurityGroupValidator:
     def _check_duplicate_rules(self, sg_name: str, rule_type: str, rules: List[Dict[str, Any]], 
                               summary: ValidationSummary):
         """Detect duplicate rules within a security group"""
+        sort_tuple = self._safe_sort_tuple
         seen = {}
         for i, rule in enumerate(rules):
             if not isinstance(rule, dict):
                 continue
-            normalized = self._normalize_rule(rule)
-            if normalized in seen:
-                first_index = seen[normalized]
+            # Hashable representation of the rule; list fields are order-insensitive
+            get = rule.get
+            normalized = (
+                get('protocol'),
+                get('from_port'),
+                get('to_port'),
+                sort_tuple(get('cidr_blocks', [])),
+                sort_tuple(get('ipv6_cidr_blocks', [])),
+                sort_tuple(get('security_groups', [])),
+                sort_tuple(get('prefix_list_ids', [])),
+                get('self', False),
+            )
+            first_index = seen.setdefault(normalized, i)
+            if first_index != i:
                 summary.add_result(ValidationResult(
                     level='error',
                     message=f"❌ Duplicate rule: {sg_name} {rule_type}[{i}] is identical to {rule_type}[{first_index}] — AWS will silently dedupe this but it indicates a copy-paste error.\n   → Remove the duplicate rule.",
                     rule='rule_duplicate',
                     context=f"security_group.{sg_name}.{rule_type}[{i}]"
                 ))
-            else:
-                seen[normalized] = i
 
+    @staticmethod
+    def _rule_context(sg_name: str, rule_type: str, rule_index: int) -> str:
+        """Build the result context for a single rule (only needed once a result is emitted)"""
+        return f"security_group.{sg_name}.{rule_type}[{rule_index}]"
+    
     def _validate_security_group_rule(self, sg_name: str, rule_type: str, rule_index: int, 
                                     rule: Dict[str, Any], summary: ValidationSummary):
         """Validate a single security group rule"""
-        context = f"security_group.{sg_name}.{rule_type}[{rule_index}]"
+        # Check for unknown keys (typo detection)
+        if isinstance(rule, dict):
+            summary.add_errors([
+                ValidationResult(
+                    level='error',
+                    message=f"❌ Unknown key '{key}' in {sg_name} {rule_type}[{rule_index}] — valid keys: {', '.join(sorted(self.KNOWN_RULE_KEYS))}\n   → This key will be ignored. Check spelling.",
+                    rule='schema_unknown_rule_key',
+                    context=self._rule_context(sg_name, rule_type, rule_index)
+                )
+                for key in sorted(k for k in rule if k not in self.KNOWN_RULE_KEYS)
+            ])
+            
+            # Non-ASCII characters in the rule description and CIDRs
+            description = rule.get('description')
+            if type(description) is str:
+                self._check_printable(description, summary, "security_group.%s.%s[%d].description",
+                                      sg_name, rule_type, rule_index)
+            for cidr_field in ('cidr_blocks', 'ipv6_cidr_blocks'):
+                cidrs = rule.get(cidr_field)
+                if type(cidrs) is list:
+                    for j, cidr in enumerate(cidrs):
+                        if type(cidr) is str:
+                            self._check_printable(cidr, summary, "security_group.%s.%s[%d].%s[%d]",
+                                                  sg_name, rule_type, rule_index, cidr_field, j)
         
         # Required fields for rules
         if 'protocol' not in rule:
@@ -662,35 +974,31 @@ class SecurityGroupValidator:
                 level='error',
                 message=f"Rule in {sg_name} {rule_type}[{rule_index}] is missing 'protocol'",
                 rule='rule_required_protocol',
-                context=context
+                context=self._rule_context(sg_name, rule_type, rule_index)
             ))
             return
         
         protocol = rule['protocol']
         
-        # Validate protocol
-        valid_protocols = ['tcp', 'udp', 'icmp', 'icmpv6', 'ah', 'esp', 'gre', 'all', '-1']
-        if protocol not in valid_protocols:
-            # Check if it's a protocol number
-            try:
-                proto_num = int(protocol)
-                if not (0 <= proto_num <= 255):
-                    summary.add_result(ValidationResult(
-                        level='error',
-                        message=f"Invalid protocol '{protocol}' in {sg_name} {rule_type}[{rule_index}]",
-                        rule='rule_invalid_protocol',
-                        context=context
-                    ))
-            except ValueError:
+        # Validate protocol — named protocols first, then IANA protocol numbers
+        if not (isinstance(protocol, str) and protocol in self.VALID_PROTOCOLS):
+            if isinstance(protocol, int):
+                proto_num = protocol
+            else:
+                try:
+                    proto_num = int(protocol)
+                except (ValueError, TypeError):
+                    proto_num = None
+            if proto_num is None or not (0 <= proto_num <= 255):
                 summary.add_result(ValidationResult(
                     level='error',
                     message=f"Invalid protocol '{protocol}' in {sg_name} {rule_type}[{rule_index}]",
                     rule='rule_invalid_protocol',
-                    context=context
+                    context=self._rule_context(sg_name, rule_type, rule_index)
                 ))
         
         # Validate ports for TCP/UDP
-        if protocol in ['tcp', 'udp']:
+        if protocol in ('tcp', 'udp'):
             self._validate_port_range(sg_name, rule_type, rule_index, rule, summary)
         
         # Validate CIDR blocks, security groups, and prefix lists
@@ -699,8 +1007,6 @@ class SecurityGroupValidator:
     def _validate_port_range(self, sg_name: str, rule_type: str, rule_index: int, 
                             rule: Dict[str, Any], summary: ValidationSummary):
         """Validate port ranges in security group rules"""
-        context = f"security_group.{sg_name}.{rule_type}[{rule_index}]"
-        
         from_port = rule.get('from_port')
         to_port = rule.get('to_port')
         
@@ -710,32 +1016,36 @@ class SecurityGroupValidator:
                 level='error',
                 message=f"TCP/UDP rule in {sg_name} {rule_type}[{rule_index}] requires 'from_port' and 'to_port'",
                 rule='rule_required_ports',
-                context=context
+                context=self._rule_context(sg_name, rule_type, rule_index)
             ))
             return
         
-        # Validate port numbers
-        for port_field, port_value in [('from_port', from_port), ('to_port', to_port)]:
-            try:
-                port_num = int(port_value)
-                if not (0 <= port_num <= 65535):
+        # Validate port numbers (YAML normally hands us ints already)
+        port_nums = []
+        for port_field, port_value in (('from_port', from_port), ('to_port', to_port)):
+            if isinstance(port_value, int):
+                port_num = port_value
+            else:
+                try:
+                    port_num = int(port_value)
+                except (ValueError, TypeError):
                     summary.add_result(ValidationResult(
                         level='error',
-                        message=f"Invalid {port_field} '{port_value}' in {sg_name} {rule_type}[{rule_index}] (must be 0-65535)",
-                        rule='rule_invalid_port',
-                        context=context
+                        message=f"Invalid {port_field} '{port_value}' in {sg_name} {rule_type}[{rule_index}] (must be a number)",
+                        rule='rule_invalid_port_type',
+                        context=self._rule_context(sg_name, rule_type, rule_index)
                     ))
-            except (ValueError, TypeError):
+                    return
+            if not (0 <= port_num <= 65535):
                 summary.add_result(ValidationResult(
                     level='error',
-                    message=f"Invalid {port_field} '{port_value}' in {sg_name} {rule_type}[{rule_index}] (must be a number)",
-                    rule='rule_invalid_port_type',
-                    context=context
+                    message=f"Invalid {port_field} '{port_value}' in {sg_name} {rule_type}[{rule_index}] (must be 0-65535)",
+                    rule='rule_invalid_port',
+                    context=self._rule_context(sg_name, rule_type, rule_index)
                 ))
-                return
+            port_nums.append(port_num)
         
-        from_port = int(from_port)
-        to_port = int(to_port)
+        from_port, to_port = port_nums
         
         # Validate port range
         if from_port > to_port:
@@ -743,140 +1053,86 @@ class SecurityGroupValidator:
                 level='error',
                 message=f"Invalid port range in {sg_name} {rule_type}[{rule_index}]: from_port ({from_port}) > to_port ({to_port})",
                 rule='rule_invalid_port_range',
-                context=context
+                context=self._rule_context(sg_name, rule_type, rule_index)
             ))
             return
         
         # Check port range size limits
         port_range_size = to_port - from_port + 1
-        max_range_size = self.guardrails.get('validation', {}).get('port_ranges', {}).get('max_range_size', 1000)
+        max_range_size = self._max_port_range
         
         if port_range_size > max_range_size:
-            message = (f"❌ Port range {from_port}-{to_port} is too broad ({port_range_size} ports, max {max_range_size}) — this effectively opens all ports.\n"
-                      f"   → Narrow to specific ports your application needs (e.g., 443, 8080).\n"
-                      f"   → EKS node communication is handled by baseline profiles via AFT — not this repo.")
             summary.add_result(ValidationResult(
                 level='error',
-                message=message,
+                message=self._MSG_PORT_RANGE_TOO_LARGE % (from_port, to_port, port_range_size, max_range_size),
                 rule='rule_port_range_too_large',
-                context=context
+                context=self._rule_context(sg_name, rule_type, rule_index)
             ))
         
         # Check for blocked ports
-        blocked_ports = self.guardrails.get('validation', {}).get('blocked_ports', [])
-        for port in range(from_port, to_port + 1):
-            if port in blocked_ports:
-                port_desc = self._get_port_description(port)
-                if port in [135, 139]:
-                    reason = "commonly exploited for lateral movement attacks. Not needed for cloud workloads"
-                    suggestion = "Remove this rule. If you need Windows RPC, contact the security team."
-                elif port == 23:
-                    reason = "transmits data in plain text, easily intercepted by attackers"
-                    suggestion = "Use SSH (port 22) or AWS Systems Manager Session Manager instead."
-                elif port == 3389:
-                    reason = "commonly brute-forced and vulnerable to exploits"
-                    suggestion = "Use AWS Systems Manager Session Manager for Windows access."
-                elif port in [21, 25]:
-                    reason = "insecure protocols that transmit credentials in plain text"
-                    suggestion = "Use secure alternatives (SFTP, encrypted email protocols)."
-                else:
-                    reason = "blocked for security reasons"
-                    suggestion = "Remove this rule or contact the security team if required."
-                
-                message = (f"❌ Port {port_desc} is blocked — {reason}.\n"
-                          f"   → {suggestion}")
-                summary.add_result(ValidationResult(
-                    level='error',
-                    message=message,
-                    rule='rule_blocked_port',
-                    context=context
-                ))
-        
-        # High-signal security warnings — only patterns that are genuinely risky
+        # Walk the (small) blocked list rather than every port in the range
+        for port, message in self._blocked_ports:
+            if from_port <= port <= to_port:
+                summary.emit('error', 'rule_blocked_port', self._rule_context(sg_name, rule_type, rule_index), message)
+        
+        # High-signal security warnings — only patterns that are genuinely risky,
+        # and only for ingress from a CIDR range (from a SG is fine)
+        if rule_type != 'ingress' or not self.record_warnings:
+            return
         cidr_list = rule.get('cidr_blocks', [])
         if not isinstance(cidr_list, list):
             cidr_list = [cidr_list] if isinstance(cidr_list, str) else []
-        has_cidr_source = bool(cidr_list)
-        has_broad_cidr = any(c in ['10.0.0.0/8', '172.16.0.0/12', '192.168.0.0/16'] for c in cidr_list)
-        
-        # 1. SSH/RDP from a CIDR range (from a SG is fine)
-        if rule_type == 'ingress' and has_cidr_source:
-            if from_port <= 22 <= to_port:
-                summary.add_result(ValidationResult(
-                    level='warning',
-                    message=f"⚠️ HIGH: SSH (port 22) ingress from CIDR — any host in that range gets SSH access. PCI DSS Req 1.3.2",
-                    rule='high_risk_pattern',
-                    context=context
-                ))
-            if from_port <= 3389 <= to_port:
+        if cidr_list:
+            # 1. SSH/RDP and database ports
+            for sensitive_port, message in self.CIDR_SENSITIVE_PORTS:
+                if from_port <= sensitive_port <= to_port:
+                    summary.emit('warning', 'high_risk_pattern', self._rule_context(sg_name, rule_type, rule_index), message)
+            
+            # 2. Broad internal CIDR (10.0.0.0/8 etc.)
+            if not self.BROAD_INTERNAL_CIDRS.isdisjoint(c for c in cidr_list if isinstance(c, str)):
                 summary.add_result(ValidationResult(
                     level='warning',
-                    message=f"⚠️ HIGH: RDP (port 3389) ingress from CIDR — any host in that range gets RDP access. PCI DSS Req 1.3.2",
-                    rule='high_risk_pattern',
-                    context=context
+                    message="⚠️ MEDIUM: Ingress from overly broad internal CIDR (e.g. 10.0.0.0/8) — scope to specific VPC or subnet CIDRs. PCI DSS Req 1.2.1",
+                    rule='broad_cidr_pattern',
+                    context=self._rule_context(sg_name, rule_type, rule_index)
                 ))
-        
-        # 2. Database ports from a CIDR range
-        db_ports = {3306: 'MySQL', 5432: 'PostgreSQL', 1433: 'MSSQL', 27017: 'MongoDB', 6379: 'Redis'}
-        if rule_type == 'ingress' and has_cidr_source:
-            for db_port, db_name in db_ports.items():
-                if from_port <= db_port <= to_port:
-                    summary.add_result(ValidationResult(
-                        level='warning',
-                        message=f"⚠️ HIGH: {db_name} (port {db_port}) ingress from CIDR — CIDR-based database access is a common audit finding. PCI DSS Req 1.3.1",
-                        rule='high_risk_pattern',
-                        context=context
-                    ))
-        
-        # 3. Broad internal CIDR (10.0.0.0/8 etc.)
-        if rule_type == 'ingress' and has_broad_cidr:
-            summary.add_result(ValidationResult(
-                level='warning',
-                message=f"⚠️ MEDIUM: Ingress from overly broad internal CIDR (e.g. 10.0.0.0/8) — scope to specific VPC or subnet CIDRs. PCI DSS Req 1.2.1",
-                rule='broad_cidr_pattern',
-                context=context
-            ))
     
     def _validate_rule_sources(self, sg_name: str, rule_type: str, rule_index: int, 
                              rule: Dict[str, Any], summary: ValidationSummary):
         """Validate CIDR blocks, security groups, and prefix lists in rules"""
-        context = f"security_group.{sg_name}.{rule_type}[{rule_index}]"
-        
         # Check for at least one source/destination
-        source_fields = ['cidr_blocks', 'ipv6_cidr_blocks', 'security_groups', 'self', 'prefix_list_ids']
-        has_source = any(field in rule for field in source_fields)
-        
-        if not has_source:
+        present = self.SOURCE_FIELDS.intersection(rule)
+        if not present:
             summary.add_result(ValidationResult(
                 level='error',
                 message=f"Rule in {sg_name} {rule_type}[{rule_index}] must specify at least one source/destination",
                 rule='rule_missing_source',
-                context=context
+                context=self._rule_context(sg_name, rule_type, rule_index)
             ))
             return
         
         # Validate CIDR blocks
-        for cidr_field in ['cidr_blocks', 'ipv6_cidr_blocks']:
-            if cidr_field in rule:
+        for cidr_field in ('cidr_blocks', 'ipv6_cidr_blocks'):
+            if cidr_field in present:
                 is_ipv6 = cidr_field == 'ipv6_cidr_blocks'
                 cidr_value = rule[cidr_field]
                 
                 # Type check — must be a list
-                if isinstance(cidr_value, str):
+                if type(cidr_value) is str:
                     summary.add_result(ValidationResult(
                         level='error',
                         message=f"❌ '{cidr_field}' in {sg_name} {rule_type}[{rule_index}] must be a list, not a bare string.\n   → Change: {cidr_field}: \"{cidr_value}\"\n   → To:     {cidr_field}: [\"{cidr_value}\"]",
                         rule='rule_cidr_type',
-                        context=context
+                        context=self._rule_context(sg_name, rule_type, rule_index)
                     ))
                     # Still validate the single CIDR so they get useful feedback
                     self._validate_cidr_block(sg_name, rule_type, rule_index, cidr_value, is_ipv6, summary, rule)
-                elif not isinstance(cidr_value, list):
+                elif type(cidr_value) is not list:
                     summary.add_result(ValidationResult(
                         level='error',
                         message=f"'{cidr_field}' in {sg_name} {rule_type}[{rule_index}] must be a list, got {type(cidr_value).__name__}",
                         rule='rule_cidr_type',
-                        context=context
+                        context=self._rule_context(sg_name, rule_type, rule_index)
                     ))
                 else:
                     # Terraform only uses the first CIDR — warn if multiple specified
@@ -885,78 +1141,76 @@ class SecurityGroupValidator:
                             level='error',
                             message=f"❌ '{cidr_field}' in {sg_name} {rule_type}[{rule_index}] has {len(cidr_value)} entries, but Terraform only applies the first one — the rest are silently ignored.\n   → Split into separate rules, one CIDR per rule.",
                             rule='rule_multi_cidr',
-                            context=context
+                            context=self._rule_context(sg_name, rule_type, rule_index)
                         ))
                     for cidr in cidr_value:
-                        if not isinstance(cidr, str):
+                        if type(cidr) is not str:
                             summary.add_result(ValidationResult(
                                 level='error',
                                 message=f"CIDR block in {sg_name} {rule_type}[{rule_index}] must be a string, got {type(cidr).__name__}: {cidr}",
                                 rule='rule_cidr_item_type',
-                                context=context
+                                context=self._rule_context(sg_name, rule_type, rule_index)
                             ))
                         else:
                             self._validate_cidr_block(sg_name, rule_type, rule_index, cidr, is_ipv6, summary, rule)
         
         # Validate 'self' field
-        if 'self' in rule:
-            if not isinstance(rule['self'], bool):
+        if 'self' in present:
+            if type(rule['self']) is not bool:
                 summary.add_result(ValidationResult(
                     level='error',
                     message=f"'self' in {sg_name} {rule_type}[{rule_index}] must be true or false, got \"{rule['self']}\"",
                     rule='rule_self_type',
-                    context=context
+                    context=self._rule_context(sg_name, rule_type, rule_index)
                 ))
         
         # Validate security group references
-        if 'security_groups' in rule:
-            if not isinstance(rule['security_groups'], list):
+        if 'security_groups' in present:
+            if type(rule['security_groups']) is not list:
                 summary.add_result(ValidationResult(
                     level='error',
                     message=f"'security_groups' in {sg_name} {rule_type}[{rule_index}] must be a list",
                     rule='rule_sg_ref_type',
-                    context=context
+                    context=self._rule_context(sg_name, rule_type, rule_index)
                 ))
             else:
                 for sg_ref in rule['security_groups']:
                     self._validate_security_group_reference(sg_name, rule_type, rule_index, sg_ref, summary)
         
         # Validate prefix list references
-        if 'prefix_list_ids' in rule:
-            if not isinstance(rule['prefix_list_ids'], list):
+        if 'prefix_list_ids' in present:
+            if type(rule['prefix_list_ids']) is not list:
                 summary.add_result(ValidationResult(
                     level='error',
                     message=f"'prefix_list_ids' in {sg_name} {rule_type}[{rule_index}] must be a list",
                     rule='rule_prefix_list_type',
-                    context=context
+                    context=self._rule_context(sg_name, rule_type, rule_index)
                 ))
             else:
-                for prefix_list_id in rule['prefix_list_ids']:
+                prefix_list_ids = rule['prefix_list_ids']
+                for prefix_list_id in prefix_list_ids:
                     self._validate_prefix_list_reference(sg_name, rule_type, rule_index, prefix_list_id, summary)
+                # Named (non pl-) references are checked against the allowlist after the walk
+                self._referenced_prefix_lists.update(
+                    pid for pid in prefix_list_ids if not pid.startswith('pl-')
+                )
     
     def _validate_cidr_block(self, sg_name: str, rule_type: str, rule_index: int, 
                            cidr: str, is_ipv6: bool, summary: ValidationSummary, rule: Dict[str, Any] = None):
         """Validate a CIDR block"""
-        context = f"security_group.{sg_name}.{rule_type}[{rule_index}]"
-        
         # Validate CIDR format
-        try:
-            if is_ipv6:
-                network = ipaddress.IPv6Network(cidr, strict=False)
-            else:
-                network = ipaddress.IPv4Network(cidr, strict=False)
-        except (ipaddress.AddressValueError, ipaddress.NetmaskValueError) as e:
+        network, parse_error = _parse_cidr_block(cidr, is_ipv6)
+        if network is None:
             summary.add_result(ValidationResult(
                 level='error',
-                message=f"Invalid CIDR block '{cidr}' in {sg_name} {rule_type}[{rule_index}]: {e}",
+                message=f"Invalid CIDR block '{cidr}' in {sg_name} {rule_type}[{rule_index}]: {parse_error}",
                 rule='rule_invalid_cidr',
-                context=context
+                context=self._rule_context(sg_name, rule_type, rule_index)
             ))
             return
         
         # Check against blocked CIDRs
-        blocked_cidrs = self.guardrails.get('validation', {}).get('blocked_cidrs', [])
-        if cidr in blocked_cidrs:
+        if cidr in self._blocked_cidrs:
             if rule_type == 'ingress':
                 message = (f"❌ {cidr} ingress is not allowed — this opens the port to the entire internet.\n"
                           f"   → Use a specific CIDR, security group reference, or prefix list instead.\n"
@@ -969,7 +1223,7 @@ class SecurityGroupValidator:
                 level='error',
                 message=message,
                 rule='rule_blocked_cidr',
-                context=context
+                context=self._rule_context(sg_name, rule_type, rule_index)
             ))
         
         # Special handling for 0.0.0.0/0 and ::/0
@@ -982,7 +1236,7 @@ class SecurityGroupValidator:
                     level='error',
                     message=message,
                     rule='rule_open_internet',
-                    context=context
+                    context=self._rule_context(sg_name, rule_type, rule_index)
                 ))
             elif rule_type == 'egress':
                 r_from = rule.get('from_port', 0) if rule else 0
@@ -996,28 +1250,24 @@ class SecurityGroupValidator:
                     level='warning',
                     message=message,
                     rule='rule_open_egress',
-                    context=context
+                    context=self._rule_context(sg_name, rule_type, rule_index)
                 ))
     
     def _validate_security_group_reference(self, sg_name: str, rule_type: str, rule_index: int, 
                                          sg_ref: str, summary: ValidationSummary):
         """Validate security group reference"""
-        context = f"security_group.{sg_name}.{rule_type}[{rule_index}]"
-        
         # Should be either a security group ID (sg-xxxxxxxx) or a name reference
-        if not (sg_ref.startswith('sg-') or sg_ref.isalnum() or '-' in sg_ref):
+        if not self.SG_REF_RE.match(sg_ref):
             summary.add_result(ValidationResult(
                 level='warning',
                 message=f"Security group reference '{sg_ref}' in {sg_name} {rule_type}[{rule_index}] may be invalid",
                 rule='rule_sg_reference_format',
-                context=context
+                context=self._rule_context(sg_name, rule_type, rule_index)
             ))
     
     def _validate_prefix_list_reference(self, sg_name: str, rule_type: str, rule_index: int, 
                                       prefix_list_id: str, summary: ValidationSummary):
         """Validate prefix list reference"""
-        context = f"security_group.{sg_name}.{rule_type}[{rule_index}]"
-        
         # Check if it's a managed prefix list ID or a name from our config
         if prefix_list_id.startswith('pl-'):
             # AWS managed prefix list ID
@@ -1025,143 +1275,85 @@ class SecurityGroupValidator:
                 level='info',
                 message=f"Using AWS managed prefix list '{prefix_list_id}' in {sg_name} {rule_type}[{rule_index}]",
                 rule='rule_aws_prefix_list',
-                context=context
+                context=self._rule_context(sg_name, rule_type, rule_index)
             ))
         else:
             # Should be defined in our prefix-lists.yaml
-            if prefix_list_id not in self.prefix_lists.get('prefix_lists', {}):
+            if prefix_list_id not in self._defined_prefix_lists:
                 summary.add_result(ValidationResult(
                     level='error',
                     message=f"Undefined prefix list '{prefix_list_id}' in {sg_name} {rule_type}[{rule_index}]",
                     rule='rule_undefined_prefix_list',
-                    context=context
+                    context=self._rule_context(sg_name, rule_type, rule_index)
                 ))
     
-    def _validate_naming_conventions(self, data: Dict[str, Any], summary: ValidationSummary):
-        """Validate naming conventions for security groups"""
-        if 'security_groups' not in data or not isinstance(data['security_groups'], dict):
-            return
+    def _validate_security_group_name(self, sg_name: str, summary: ValidationSummary, context: Optional[str] = None):
+        """Validate naming conventions for a security group name"""
+        if context is None:
+            context = f"security_group.{sg_name}"
+        sg_name_re = self._sg_name_re
+        max_length = self._max_name_length
+        
+        # Check pattern
+        if not sg_name_re.match(sg_name):
+            summary.add_result(ValidationResult(
+                level='error',
+                message=f"Security group name '{sg_name}' doesn't match required pattern: {sg_name_re.pattern}",
+                rule='naming_pattern_violation',
+                context=context
+            ))
         
-        naming_config = self.guardrails.get('validation', {}).get('naming', {})
-        sg_pattern = naming_config.get('security_group_pattern', r'^[a-z0-9][a-z0-9-]*[a-z0-9]$')
-        max_length = naming_config.get('max_name_length', 63)
+        # Check length
+        if len(sg_name) > max_length:
+            summary.add_result(ValidationResult(
+                level='error',
+                message=f"Security group name '{sg_name}' is too long ({len(sg_name)} chars, max {max_length})",
+                rule='naming_length_violation',
+                context=context
+            ))
         
-        for sg_name in data['security_groups']:
-            # Check pattern
-            if not re.match(sg_pattern, sg_name):
-                summary.add_result(ValidationResult(
-                    level='error',
-                    message=f"Security group name '{sg_name}' doesn't match required pattern: {sg_pattern}",
-                    rule='naming_pattern_violation',
-                    context=f"security_group.{sg_name}"
-                ))
-            
-            # Check length
-            if len(sg_name) > max_length:
-                summary.add_result(ValidationResult(
-                    level='error',
-                    message=f"Security group name '{sg_name}' is too long ({len(sg_name)} chars, max {max_length})",
-                    rule='naming_length_violation',
-                    context=f"security_group.{sg_name}"
-                ))
-            
-            # Check for reserved words/patterns
-            reserved_patterns = ['default', 'baseline', 'aws-', 'amazon-']
-            for pattern in reserved_patterns:
-                if sg_name.startswith(pattern):
-                    summary.add_result(ValidationResult(
-                        level='warning',
-                        message=f"Security group name '{sg_name}' starts with reserved pattern '{pattern}'",
-                        rule='naming_reserved_pattern',
-                        context=f"security_group.{sg_name}"
-                    ))
+        # Check for reserved words/patterns (the prefixes are mutually exclusive)
+        reserved = self.RESERVED_NAME_RE.match(sg_name)
+        if reserved:
+            summary.add_result(ValidationResult(
+                level='warning',
+                message=f"Security group name '{sg_name}' starts with reserved pattern '{reserved.group(1)}'",
+                rule='naming_reserved_pattern',
+                context=context
+            ))
+        
+        self._check_printable(sg_name, summary, "%s.name", context)
     
-
-    def _validate_unicode_characters(self, data: Dict[str, Any], summary: ValidationSummary):
-        """Validate that all string fields contain only ASCII-printable characters.
+    def _check_printable(self, value: str, summary: ValidationSummary, path_fmt: str, *path_args):
+        """Validate that a string field contains only ASCII-printable characters.
         
         Non-ASCII characters (unicode, emoji, zero-width chars, homoglyphs) in security
         group names, descriptions, tags, and CIDR values can cause TFE/Terraform errors
         or create confusing/misleading configurations.
-        """
-        import string
-        PRINTABLE = set(string.printable)
-        
-        def check_ascii(value: str, field_path: str):
-            """Check a string value for non-ASCII/non-printable characters."""
-            for i, ch in enumerate(value):
-                if ch not in PRINTABLE:
-                    # Get a readable representation of the offending character
-                    char_repr = repr(ch)
-                    cp = ord(ch)
-                    summary.add_result(ValidationResult(
-                        level='error',
-                        message=f"Non-ASCII character {char_repr} (U+{cp:04X}) found in {field_path} at position {i} — only ASCII-printable characters are allowed. Non-ASCII characters cause TFE/Terraform errors.",
-                        rule='unicode_character',
-                        context=field_path
-                    ))
-                    return  # One error per field is enough
         
-        if 'security_groups' not in data or not isinstance(data['security_groups'], dict):
+        The field path is given as a %-template and only formatted when an error is recorded.
+        """
+        # Fast path: clean single-line strings are fully checked in C
+        if value.isascii() and value.isprintable():
             return
-        
-        for sg_name, sg_config in data['security_groups'].items():
-            # Check SG name
-            check_ascii(sg_name, f"security_group.{sg_name}.name")
-            
-            if not isinstance(sg_config, dict):
-                continue
-            
-            # Check description
-            if 'description' in sg_config and isinstance(sg_config['description'], str):
-                check_ascii(sg_config['description'], f"security_group.{sg_name}.description")
-            
-            # Check tags
-            if 'tags' in sg_config and isinstance(sg_config['tags'], dict):
-                for tag_key, tag_value in sg_config['tags'].items():
-                    if isinstance(tag_key, str):
-                        check_ascii(tag_key, f"security_group.{sg_name}.tags.key.{tag_key}")
-                    if isinstance(tag_value, str):
-                        check_ascii(tag_value, f"security_group.{sg_name}.tags.value.{tag_key}")
-            
-            # Check rules
-            for rule_type in ['ingress', 'egress']:
-                if rule_type not in sg_config or not isinstance(sg_config[rule_type], list):
-                    continue
-                for i, rule in enumerate(sg_config[rule_type]):
-                    if not isinstance(rule, dict):
-                        continue
-                    # Check rule description
-                    if 'description' in rule and isinstance(rule['description'], str):
-                        check_ascii(rule['description'], f"security_group.{sg_name}.{rule_type}[{i}].description")
-                    # Check CIDR blocks
-                    for cidr_field in ['cidr_blocks', 'ipv6_cidr_blocks']:
-                        if cidr_field in rule and isinstance(rule[cidr_field], list):
-                            for j, cidr in enumerate(rule[cidr_field]):
-                                if isinstance(cidr, str):
-                                    check_ascii(cidr, f"security_group.{sg_name}.{rule_type}[{i}].{cidr_field}[{j}]")
-
-    def _validate_prefix_list_references(self, data: Dict[str, Any], summary: ValidationSummary):
-        """Validate that all referenced prefix lists are defined"""
-        if 'security_groups' not in data or not isinstance(data['security_groups'], dict):
+        match = self.NON_PRINTABLE_RE.search(value)
+        if match is None:
             return
+        # Only the first offending character is reported — one error per field is enough
+        ch = match.group()
+        field_path = path_fmt % path_args
+        summary.add_result(ValidationResult(
+            level='error',
+            message=f"Non-ASCII character {ch!r} (U+{ord(ch):04X}) found in {field_path} at position {match.start()} — only ASCII-printable characters are allowed. Non-ASCII characters cause TFE/Terraform errors.",
+            rule='unicode_character',
+            context=field_path
+        ))
+
+    def _validate_prefix_list_references(self, summary: ValidationSummary):
+        """Validate that all prefix lists referenced during the SG walk are defined"""
+        undefined_prefix_lists = self._referenced_prefix_lists - self._defined_prefix_lists
         
-        referenced_prefix_lists = set()
-        
-        for sg_name, sg_config in data['security_groups'].items():
-            for rule_type in ['ingress', 'egress']:
-                if rule_type in sg_config:
-                    for rule in sg_config[rule_type]:
-                        if 'prefix_list_ids' in rule:
-                            for prefix_list_id in rule['prefix_list_ids']:
-                                if not prefix_list_id.startswith('pl-'):
-                                    referenced_prefix_lists.add(prefix_list_id)
-        
-        # Check that all referenced prefix lists are defined
-        defined_prefix_lists = set(self.prefix_lists.get('prefix_lists', {}).keys())
-        undefined_prefix_lists = referenced_prefix_lists - defined_prefix_lists
-        
-        for prefix_list in undefined_prefix_lists:
+        for prefix_list in sorted(undefined_prefix_lists):
             summary.add_result(ValidationResult(
                 level='error',
                 message=f"Referenced prefix list '{prefix_list}' is not defined in prefix-lists.yaml",
@@ -1261,8 +1453,30 @@ class SecurityGroupValidator:
         return "\n".join(output)
 
 
-def main():
-    """Main entry point"""
+def _write_json(payload: Any, indent: bool = True):
+    """Write a JSON document to stdout, using orjson when available.
+    
+    ValidationResults may be left in the payload as-is; they're converted with
+    _result_to_dict as the encoder reaches them.
+    """
+    if orjson is not None:
+        option = orjson.OPT_PASSTHROUGH_DATACLASS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        sys.stdout.flush()
+        sys.stdout.buffer.write(orjson.dumps(payload, default=_result_to_dict, option=option) + b"\n")
+        sys.stdout.buffer.flush()
+    else:
+        import json
+        json.dump(payload, sys.stdout, indent=2 if indent else None, separators=(',', ': ' if indent else ':'),
+                  ensure_ascii=False, default=_result_to_dict)
+        sys.stdout.write("\n")
+
+
+def _build_parser():
+    """Build the full command-line parser"""
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description='Validate AWS Security Group YAML configuration',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -1275,12 +1489,30 @@ Exit codes:
 Examples:
   python validate.py accounts/123456789012
   python validate.py accounts/production
+  python validate.py accounts/111111111111 accounts/222222222222
+  python validate.py --accounts-root accounts -j 4
         """
     )
     
     parser.add_argument(
-        'account_dir',
-        help='Path to the account directory containing security-groups.yaml'
+        'account_dirs',
+        nargs='*',
+        metavar='account_dir',
+        help='Path to an account directory containing security-groups.yaml '
+             '(several directories are validated in parallel)'
+    )
+    
+    parser.add_argument(
+        '--accounts-root',
+        metavar='DIR',
+        help='Also validate every <account-id> directory under DIR (e.g. accounts/)'
+    )
+    
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        metavar='N',
+        help='Maximum number of accounts validated in parallel (default: CPU count)'
     )
     
     parser.add_argument(
@@ -1308,122 +1540,238 @@ Examples:
         help='Suppress warning output (only show errors)'
     )
     
-    args = parser.parse_args()
+    parser.add_argument(
+        '--quiet', '-q',
+        action='store_true',
+        help='Print nothing; only set the exit code'
+    )
+    
+    parser.add_argument(
+        '--ascii',
+        action='store_true',
+        help='Use plain ASCII symbols in text output (for CI logs that mangle emoji)'
+    )
+    
+    return parser
+
+
+def _parse_args(argv: List[str]):
+    """Parse command-line arguments.
+    
+    The common CI invocation (a single account directory, no flags) skips
+    building the argparse parser entirely.
+    """
+    if len(argv) == 1 and not argv[0].startswith('-'):
+        return SimpleNamespace(account_dirs=[argv[0]], format='text', verbose=False,
+                               warnings_as_errors=False, no_warnings=False, quiet=False, ascii=False,
+                               accounts_root=None, jobs=None)
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    if not args.account_dirs and args.accounts_root is None:
+        parser.error('an account directory or --accounts-root is required')
+    return args
+
+
+# ASCII stand-ins for the symbols used in text output and result messages
+_ASCII_SYMBOLS = str.maketrans({
+    '🔍': '[>]',
+    '📁': '[dir]',
+    '📊': '[=]',
+    '❌': '[x]',
+    '⚠': '[!]',
+    '✅': '[ok]',
+    'ℹ': '[i]',
+    '\ufe0f': None,  # emoji variation selector
+    '•': '*',
+    '—': '-',
+    '→': '->',
+})
+
+
+def _to_ascii(text: str) -> str:
+    """Replace output symbols with ASCII; anything else non-ASCII becomes '?'"""
+    text = text.translate(_ASCII_SYMBOLS)
+    if text.isascii():
+        return text
+    return text.encode('ascii', 'replace').decode('ascii')
+
+
+def _run_account(args, account_dir: str) -> Tuple[Any, Optional[str], int]:
+    """Validate one account directory and render its report.
+    
+    Returns (report, error, exit_code). The report is the formatted text or
+    markdown, or the payload dict for JSON; error is set instead when the
+    directory couldn't be validated at all.
+    """
+    # Fail fast on a mistyped account directory before any validator work
+    if not os.path.isdir(account_dir):
+        return None, f"Account directory not found: {account_dir}", 1
     
     try:
-        validator = SecurityGroupValidator(args.account_dir)
+        # With --no-warnings the validator doesn't record warnings at all
+        validator = SecurityGroupValidator(account_dir, record_warnings=not args.no_warnings)
         summary = validator.validate()
-        
-        # Suppress warnings if requested
-        if args.no_warnings:
-            summary.warnings = []
-        
-        # Adjust exit code if warnings should be treated as errors
-        if args.warnings_as_errors and summary.has_warnings and not summary.has_errors:
-            # Convert warnings to errors
-            summary.errors.extend(summary.warnings)
-            summary.warnings = []
-        
-        # Output results
-        if args.format == 'markdown':
-            print(validator.format_markdown_output(summary))
-        elif args.format == 'json':
-            output = {
-                'account_dir': args.account_dir,
-                'account_id': validator.account_id,
-                'validation_results': {
-                    'errors': [
-                        {
-                            'level': r.level,
-                            'message': r.message,
-                            'rule': r.rule,
-                            'context': r.context,
-                            'line': r.line
-                        } for r in summary.errors
-                    ],
-                    'warnings': [
-                        {
-                            'level': r.level,
-                            'message': r.message,
-                            'rule': r.rule,
-                            'context': r.context,
-                            'line': r.line
-                        } for r in summary.warnings
-                    ],
-                    'info': [
-                        {
-                            'level': r.level,
-                            'message': r.message,
-                            'rule': r.rule,
-                            'context': r.context,
-                            'line': r.line
-                        } for r in summary.info
-                    ] if args.verbose else []
-                },
-                'summary': {
-                    'error_count': len(summary.errors),
-                    'warning_count': len(summary.warnings),
-                    'info_count': len(summary.info),
-                    'exit_code': summary.get_exit_code()
-                }
+    except ValidationException as e:
+        return None, str(e), 1
+    except OSError as e:
+        # Our own "not found" errors carry a message; raw I/O errors name the file
+        if e.filename is None:
+            return None, str(e), 1
+        return None, f"Cannot read {e.filename}: {e.strerror}", 1
+    except yaml.YAMLError as e:
+        return None, f"Invalid YAML: {e}", 1
+    
+    # Adjust exit code if warnings should be treated as errors
+    if args.warnings_as_errors and summary.has_warnings and not summary.has_errors:
+        # Convert warnings to errors (errors is empty here, so just swap the lists)
+        summary.errors, summary.warnings = summary.warnings, []
+    
+    exit_code = summary.get_exit_code()
+    
+    # Exit code only — skip formatting results nobody reads
+    if args.quiet:
+        return None, None, exit_code
+    
+    if args.format == 'markdown':
+        return validator.format_markdown_output(summary) + "\n", None, exit_code
+    
+    if args.format == 'json':
+        # Result lists go in as-is; _write_json converts each result while encoding
+        results = {
+            'errors': summary.errors,
+            'warnings': summary.warnings,
+        }
+        # Info entries are only listed in verbose mode
+        if args.verbose:
+            results['info'] = summary.info
+        output = {
+            'account_dir': account_dir,
+            'account_id': validator.account_id,
+            'validation_results': results,
+            'summary': {
+                'error_count': len(summary.errors),
+                'warning_count': len(summary.warnings),
+                'info_count': len(summary.info),
+                'exit_code': exit_code
             }
-            print(json.dumps(output, indent=2))
-        else:
-            # Text output
-            print(f"🔍 Validating AWS Security Groups for account: {validator.account_id}")
-            print(f"📁 Directory: {args.account_dir}")
-            print()
-            
-            # Print errors
-            if summary.errors:
-                print("❌ Errors:")
-                for error in summary.errors:
-                    context_str = f" [{error.context}]" if error.context else ""
-                    rule_str = f" ({error.rule})" if error.rule else ""
-                    print(f"   • {error.message}{context_str}{rule_str}")
-                print()
-            
-            # Print warnings
-            if summary.warnings:
-                print("⚠️  Warnings:")
-                for warning in summary.warnings:
-                    context_str = f" [{warning.context}]" if warning.context else ""
-                    rule_str = f" ({warning.rule})" if warning.rule else ""
-                    print(f"   • {warning.message}{context_str}{rule_str}")
-                print()
-            
-            # Print info if verbose
-            if args.verbose and summary.info:
-                print("ℹ️  Info:")
-                for info in summary.info:
-                    context_str = f" [{info.context}]" if info.context else ""
-                    rule_str = f" ({info.rule})" if info.rule else ""
-                    print(f"   • {info.message}{context_str}{rule_str}")
-                print()
-            
-            # Summary
-            print("📊 Summary:")
-            print(f"   Errors: {len(summary.errors)}")
-            print(f"   Warnings: {len(summary.warnings)}")
-            if args.verbose:
-                print(f"   Info: {len(summary.info)}")
-            
-            if summary.get_exit_code() == 0:
-                print("\n✅ All validations passed!")
-            elif summary.get_exit_code() == 2:
-                print("\n⚠️  Validation completed with warnings")
-            else:
-                print("\n❌ Validation failed with errors")
-        
-        sys.exit(summary.get_exit_code())
-        
+        }
+        return output, None, exit_code
+    
+    # Text output, assembled and written in one go
+    out = [
+        f"🔍 Validating AWS Security Groups for account: {validator.account_id}\n",
+        f"📁 Directory: {account_dir}\n",
+        "\n",
+    ]
+    sections = [("❌ Errors:\n", summary.errors), ("⚠️  Warnings:\n", summary.warnings)]
+    if args.verbose:
+        sections.append(("ℹ️  Info:\n", summary.info))
+    for header, results in sections:
+        if results:
+            out.append(header)
+            for result in results:
+                out.append(f"   • {result.format_text()}\n")
+            out.append("\n")
+    
+    # Summary
+    out.append("📊 Summary:\n")
+    out.append(f"   Errors: {len(summary.errors)}\n")
+    out.append(f"   Warnings: {len(summary.warnings)}\n")
+    if args.verbose:
+        out.append(f"   Info: {len(summary.info)}\n")
+    
+    if exit_code == 0:
+        out.append("\n✅ All validations passed!\n")
+    elif exit_code == 2:
+        out.append("\n⚠️  Validation completed with warnings\n")
+    else:
+        out.append("\n❌ Validation failed with errors\n")
+    text = "".join(out)
+    if args.ascii:
+        text = _to_ascii(text)
+    return text, None, exit_code
+
+
+def _run_account_isolated(args, account_dir: str) -> Tuple[Any, Optional[str], int]:
+    """_run_account for batch runs: an unexpected crash fails only this account.
+    
+    A single-account run lets it propagate with a full traceback instead.
+    """
+    try:
+        return _run_account(args, account_dir)
     except Exception as e:
-        if args.format == 'json':
-            print(json.dumps({'error': str(e)}, indent=2))
+        return None, f"Unexpected {type(e).__name__}: {e}", 1
+
+
+def _discover_account_dirs(accounts_root: str) -> List[str]:
+    """Account directories (12-digit names with a security-groups.yaml) under accounts_root, sorted"""
+    with os.scandir(accounts_root) as entries:
+        return sorted(
+            entry.path for entry in entries
+            if SecurityGroupValidator._is_account_id(entry.name) and entry.is_dir()
+            and os.path.isfile(os.path.join(entry.path, "security-groups.yaml"))
+        )
+
+
+def _combine_exit_codes(exit_codes: List[int]) -> int:
+    """Overall exit code: errors anywhere win over warnings anywhere"""
+    if 1 in exit_codes:
+        return 1
+    if 2 in exit_codes:
+        return 2
+    return 0
+
+
+def main():
+    """Main entry point"""
+    args = _parse_args(sys.argv[1:])
+    account_dirs = list(args.account_dirs)
+    batch = args.accounts_root is not None or len(account_dirs) > 1
+    
+    # (report, error, exit_code) per run, and the directory each run is about
+    runs = []
+    run_dirs = []
+    if args.accounts_root is not None:
+        try:
+            account_dirs.extend(_discover_account_dirs(args.accounts_root))
+        except OSError as e:
+            runs.append((None, f"Cannot read accounts root {args.accounts_root}: {e.strerror}", 1))
+            run_dirs.append(args.accounts_root)
+    run_dirs.extend(account_dirs)
+    
+    run_account = partial(_run_account_isolated if batch else _run_account, args)
+    # Accounts are independent and validation is CPU-bound, so use up to a process per core
+    workers = min(len(account_dirs), args.jobs or os.cpu_count() or 1)
+    if workers <= 1:
+        runs.extend(map(run_account, account_dirs))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_account, account_dir) for account_dir in account_dirs]
+            for future in futures:
+                # A worker that died (or a result that couldn't be sent back) fails only its account
+                e = future.exception()
+                if e is None:
+                    runs.append(future.result())
+                else:
+                    runs.append((None, f"Unexpected {type(e).__name__}: {e}", 1))
+    
+    if args.format == 'json' and not args.quiet:
+        payloads = [report if error is None else {'account_dir': account_dir, 'error': error}
+                    for account_dir, (report, error, _) in zip(run_dirs, runs)]
+        if not batch:
+            _write_json(payloads[0], indent=runs[0][1] is None)
         else:
-            print(f"❌ Validation error: {e}", file=sys.stderr)
-        sys.exit(1)
+            _write_json(payloads)
+    elif not args.quiet:
+        for account_dir, (report, error, _) in zip(run_dirs, runs):
+            if error is not None:
+                message = f"❌ Validation error in {account_dir}: {error}" if batch else f"❌ Validation error: {error}"
+                print(_to_ascii(message) if args.ascii else message, file=sys.stderr)
+            elif report is not None:
+                sys.stdout.write(report)
+    
+    sys.exit(_combine_exit_codes([exit_code for _, _, exit_code in runs]))
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -29,9 +29,31 @@ from tfe_workspace import (
 # Fixtures
 # ---------------------------------------------------------------------------
 
-@pytest.fixture
-def repo_root(tmp_path):
-    """Create a temp repo structure with account dirs."""
+class _FakeResp:
+    """Minimal stand-in for the response urlopen returns."""
+
+    def __init__(self, payload, status=200):
+        self.status = status
+        self._body = json.dumps(payload).encode()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def read(self):
+        return self._body
+
+
+@pytest.fixture(scope="session")
+def repo_root(tmp_path_factory):
+    """Create a temp repo structure with account dirs.
+
+    Built once per session — tests only read it. Tests that need their own
+    tree use tmp_path directly.
+    """
+    tmp_path = tmp_path_factory.mktemp("repo")
     accounts = tmp_path / "accounts"
     accounts.mkdir()
 
@@ -59,24 +81,35 @@ def repo_root(tmp_path):
     return tmp_path
 
 
-@pytest.fixture
-def mock_client():
-    client = MagicMock(spec=CloudIaCClient)
-    return client
+@pytest.fixture(scope="module")
+def _shared_client():
+    return MagicMock(spec=CloudIaCClient)
+
+
+@pytest.fixture(scope="module")
+def _shared_tfe_client():
+    return MagicMock(spec=TFEClient)
 
 
 @pytest.fixture
-def mock_tfe_client():
-    client = MagicMock(spec=TFEClient)
-    return client
+def mock_client(_shared_client):
+    _shared_client.reset_mock(return_value=True, side_effect=True)
+    return _shared_client
 
 
 @pytest.fixture
-def provisioner(repo_root, mock_client, mock_tfe_client):
+def mock_tfe_client(_shared_tfe_client):
+    _shared_tfe_client.reset_mock(return_value=True, side_effect=True)
+    return _shared_tfe_client
+
+
+@pytest.fixture(scope="module")
+def _base_provisioner(repo_root, _shared_client, _shared_tfe_client):
+    """Built once per module — tests only call methods on it, never reassign state."""
     return WorkspaceProvisioner(
         repo_root=str(repo_root),
-        client=mock_client,
-        tfe_client=mock_tfe_client,
+        client=_shared_client,
+        tfe_client=_shared_tfe_client,
         car_id="car-test-123",
         project_id="prj-test-456",
         repository="org-eng/aws-security-groups",
@@ -85,6 +118,11 @@ def provisioner(repo_root, mock_client, mock_tfe_client):
     )
 
 
+@pytest.fixture
+def provisioner(_base_provisioner, mock_client, mock_tfe_client):
+    return _base_provisioner
+
+
 # ---------------------------------------------------------------------------
 # Account Discovery
 # ---------------------------------------------------------------------------
@@ -96,9 +134,25 @@ class TestAccountDiscovery:
     def test_ignores_non_numeric_dirs(self, provisioner):
         assert "_example" not in provisioner.discover_accounts()
 
+    def test_ignores_non_ascii_digit_dirs(self, tmp_path):
+        acc = tmp_path / "accounts" / "１１１２２２３３３４４４"  # full-width digits
+        acc.mkdir(parents=True)
+        (acc / "security-groups.yaml").write_text('account_id: "111222333444"\n')
+        assert WorkspaceProvisioner(repo_root=str(tmp_path)).discover_accounts() == []
+
     def test_ignores_dirs_without_yaml(self, provisioner):
         assert "999999999999" not in provisioner.discover_accounts()
 
+    def test_discovery_is_cached(self, tmp_path):
+        acc = tmp_path / "accounts" / "111222333444"
+        acc.mkdir(parents=True)
+        (acc / "security-groups.yaml").write_text('account_id: "111222333444"\n')
+        p = WorkspaceProvisioner(repo_root=str(tmp_path))
+        first = p.discover_accounts()
+        first.append("mutated")
+        (tmp_path / "accounts" / "555666777888").mkdir()
+        assert p.discover_accounts() == ["111222333444"]
+
     def test_empty_accounts_dir(self, tmp_path):
         (tmp_path / "accounts").mkdir()
         p = WorkspaceProvisioner(repo_root=str(tmp_path))
@@ -289,6 +343,18 @@ class TestApply:
         results = provisioner.apply(actions)
         assert results[0]["status"] == "exists"
 
+    def test_apply_no_existence_precheck(self, provisioner, mock_client):
+        """Create is attempted directly — 409 handling replaces a lookup first."""
+        mock_client.create_workspace.return_value = {"id": "ws-new"}
+        actions = [PlanAction(
+            action="create", workspace="sg-111222333444",
+            account_id="111222333444", reason="new", details={},
+        )]
+        provisioner.plan()
+        provisioner.apply(actions)
+        mock_client.list_workspaces.assert_not_called()
+        mock_client.create_workspace.assert_called_once()
+
     def test_apply_error_handling(self, provisioner, mock_client):
         mock_client.create_workspace.side_effect = Exception("API timeout")
         actions = [PlanAction(
@@ -468,12 +534,7 @@ class TestCloudIaCAuth:
 
     @patch("tfe_workspace.urlopen")
     def test_auth_basic_auth_header(self, mock_urlopen):
-        mock_resp = MagicMock()
-        mock_resp.status = 200
-        mock_resp.read.return_value = json.dumps({"id_token": "tok-123"}).encode()
-        mock_resp.__enter__ = MagicMock(return_value=mock_resp)
-        mock_resp.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_resp
+        mock_urlopen.return_value = _FakeResp({"id_token": "tok-123"})
 
         client = CloudIaCClient(
             base_url="https://cldiac.example.com",
@@ -493,12 +554,7 @@ class TestCloudIaCAuth:
 
     @patch("tfe_workspace.urlopen")
     def test_auth_missing_id_token(self, mock_urlopen):
-        mock_resp = MagicMock()
-        mock_resp.status = 200
-        mock_resp.read.return_value = json.dumps({"access_token": "wrong"}).encode()
-        mock_resp.__enter__ = MagicMock(return_value=mock_resp)
-        mock_resp.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_resp
+        mock_urlopen.return_value = _FakeResp({"access_token": "wrong"})
 
         client = CloudIaCClient(
             base_url="https://cldiac.example.com",
@@ -553,7 +609,8 @@ class TestFormatting:
             account_id="111222333444", reason="New",
             details={"request": {}},
         )]
-        json.dumps([asdict(a) for a in actions])  # should not raise
+        json.dumps([a.to_dict() for a in actions])  # should not raise
+        assert [a.to_dict() for a in actions] == [asdict(a) for a in actions]
 
 
 # ---------------------------------------------------------------------------
@@ -616,6 +673,7 @@ class TestParallelApply:
         assert len(results) == 1
         assert results[0]["status"] == "skipped"
         mock_client.create_workspace.assert_not_called()
+        mock_client.authenticate.assert_not_called()
 
     def test_empty_actions(self, provisioner, mock_client):
         results = provisioner.apply([], max_workers=3)
@@ -5,23 +5,29 @@ Tests for the security group validation script.
 Run: python -m pytest tests/test_validate.py -v
 """
 
+import json
 import os
 import sys
-import tempfile
-import shutil
 import pytest
 import yaml
+from functools import lru_cache
+from pathlib import Path
 
 # Add scripts directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
-from validate import SecurityGroupValidator, ValidationSummary
+from validate import (SecurityGroupValidator, ValidationSummary, ValidationException, _build_parser, _parse_args,
+                      _run_account, _combine_exit_codes, _to_ascii, _discover_account_dirs, _write_json, main)
 
+# Account most tests validate as
+ACCOUNT_ID = '100000000001'
 
-@pytest.fixture
-def repo_root():
-    """Create a temporary repo root with guardrails and prefix-lists."""
-    tmpdir = tempfile.mkdtemp()
-    
+# libyaml-backed dumper when PyYAML was built with it
+_YamlDumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+
+@lru_cache(maxsize=None)
+def _config_yaml(required_tags=()):
+    """Serialized (guardrails, prefix-lists) for a test repo root, dumped once per tag set."""
     guardrails = {
         'validation': {
             'blocked_cidrs': ['0.0.0.0/0', '::/0'],
@@ -34,7 +40,7 @@ def repo_root():
             'naming': {
                 'security_group_pattern': r'^[a-z0-9][a-z0-9-]*[a-z0-9]$',
                 'max_name_length': 63,
-                'required_tags': [],  # disabled for unit tests
+                'required_tags': list(required_tags),  # empty disables tag checks for unit tests
             },
         },
         'type_overrides': {},
@@ -49,29 +55,90 @@ def repo_root():
         },
     }
     
-    with open(os.path.join(tmpdir, 'guardrails.yaml'), 'w') as f:
-        yaml.dump(guardrails, f)
-    with open(os.path.join(tmpdir, 'prefix-lists.yaml'), 'w') as f:
-        yaml.dump(prefix_lists, f)
+    return yaml.dump(guardrails, Dumper=_YamlDumper), yaml.dump(prefix_lists, Dumper=_YamlDumper)
+
+
+def _create_repo_root(tmpdir, required_tags=()):
+    """Write guardrails and prefix-lists into tmpdir and return it."""
+    guardrails_yaml, prefix_lists_yaml = _config_yaml(tuple(required_tags))
+    Path(tmpdir, 'guardrails.yaml').write_text(guardrails_yaml)
+    Path(tmpdir, 'prefix-lists.yaml').write_text(prefix_lists_yaml)
+    return tmpdir
+
+
+@pytest.fixture(scope="module")
+def repo_root(tmp_path_factory):
+    """Temporary repo root with guardrails and prefix-lists, shared by a test module.
     
-    yield tmpdir
-    shutil.rmtree(tmpdir)
+    Tests only add account directories to it; tests that change guardrails or
+    need an empty accounts/ tree use fresh_repo_root instead.
+    """
+    return _create_repo_root(str(tmp_path_factory.mktemp("repo")))
+
+
+@pytest.fixture
+def fresh_repo_root(tmp_path):
+    """A repo root private to one test."""
+    return _create_repo_root(str(tmp_path))
 
 
 def _write_sg_yaml(repo_root, account_id, data):
     """Helper to write a security-groups.yaml file and return the account dir path."""
     account_dir = os.path.join(repo_root, 'accounts', account_id)
     os.makedirs(account_dir, exist_ok=True)
-    with open(os.path.join(account_dir, 'security-groups.yaml'), 'w') as f:
-        yaml.dump(data, f)
+    Path(account_dir, 'security-groups.yaml').write_text(yaml.dump(data, Dumper=_YamlDumper))
     return account_dir
 
 
-def _validate(repo_root, account_id, data):
-    """Helper to write yaml, validate, and return summary."""
-    account_dir = _write_sg_yaml(repo_root, account_id, data)
-    validator = SecurityGroupValidator(account_dir)
-    return validator.validate()
+def _build_validator(repo_root):
+    """Load repo_root's guardrails once and return a validate(account_id, data, **kwargs) -> summary callable.
+    
+    Validators are built in memory on first use of an account_id/options pair and reused after.
+    """
+    guardrails = SecurityGroupValidator._load_config_yaml(Path(repo_root, 'guardrails.yaml'))
+    prefix_lists = SecurityGroupValidator._load_config_yaml(Path(repo_root, 'prefix-lists.yaml'))
+    validators = {}
+    
+    def validate(account_id, data, **kwargs):
+        key = (account_id, tuple(sorted(kwargs.items())))
+        validator = validators.get(key)
+        if validator is None:
+            validator = validators[key] = SecurityGroupValidator.from_dicts(
+                account_id, guardrails, prefix_lists, **kwargs)
+        return validator.validate_data(data)
+    
+    return validate
+
+
+@pytest.fixture(scope="module")
+def compiled_validator(repo_root):
+    """validate(account_id, data, **kwargs) against repo_root's guardrails."""
+    return _build_validator(repo_root)
+
+
+# Shared rule building blocks; tests copy them with {**...} rather than mutate
+_TCP_443 = {'protocol': 'tcp', 'from_port': 443, 'to_port': 443}
+_BASE_RULE_TCP_443 = {**_TCP_443, 'cidr_blocks': ['10.0.0.0/24']}
+
+
+def _make_data(sg_name='my-sg', **sg_fields):
+    """security-groups.yaml content for ACCOUNT_ID with a single SG."""
+    return {
+        'account_id': ACCOUNT_ID,
+        'security_groups': {
+            sg_name: {'description': 'test', **sg_fields},
+        },
+    }
+
+
+def _rule_set(summary):
+    """Rules of the errors in summary."""
+    return {e.rule for e in summary.errors}
+
+
+def _warn_rule_set(summary):
+    """Rules of the warnings in summary."""
+    return {w.rule for w in summary.warnings}
 
 
 # ============================================================
@@ -79,99 +146,92 @@ def _validate(repo_root, account_id, data):
 # ============================================================
 
 class TestSchemaValidation:
-    def test_missing_required_fields(self, repo_root):
-        data = {'environment': 'prod'}  # has content but missing required fields
-        summary = _validate(repo_root, '100000000001', data)
-        rules = [e.rule for e in summary.errors]
-        assert 'schema_required_fields' in rules
-
-    def test_security_groups_wrong_type(self, repo_root):
-        data = {'account_id': '100000000001', 'security_groups': 'not-a-dict'}
-        summary = _validate(repo_root, '100000000001', data)
-        rules = [e.rule for e in summary.errors]
-        assert 'schema_type' in rules
-
-    def test_unknown_top_level_key(self, repo_root):
-        data = {
-            'account_id': '100000000001',
+    @pytest.mark.parametrize('data, rule', [
+        # has content but missing required fields
+        ({'environment': 'prod'}, 'schema_required_fields'),
+        ({'account_id': ACCOUNT_ID, 'security_groups': 'not-a-dict'}, 'schema_type'),
+        ({'account_id': ACCOUNT_ID,
+          'security_groups': {'my-sg': {'description': 'test', 'ingresss': []}}},  # typo
+         'schema_unknown_sg_key'),
+        ({'account_id': ACCOUNT_ID,
+          'security_groups': {'my-sg': {'description': 'test', 'ingress': [{
+              'protocol': 'tcp',
+              'from_port': 443,
+              'to_port': 443,
+              'cidr_blocks': ['10.0.0.0/24'],
+              'descriptin': 'typo',  # typo
+          }]}}},
+         'schema_unknown_rule_key'),
+    ], ids=['missing_required_fields', 'security_groups_wrong_type', 'unknown_sg_key', 'unknown_rule_key'])
+    def test_schema_error(self, compiled_validator, data, rule):
+        summary = compiled_validator(ACCOUNT_ID, data)
+        rules = _rule_set(summary)
+        assert rule in rules
+
+    def test_top_level_not_a_mapping(self, compiled_validator):
+        summary = compiled_validator(ACCOUNT_ID, ['account_id', 'security_groups'])
+        assert [e.rule for e in summary.errors] == ['schema_type']
+
+    def test_yaml_syntax_error_names_file(self, repo_root):
+        account_dir = os.path.join(repo_root, 'accounts', '100000000007')
+        os.makedirs(account_dir, exist_ok=True)
+        sg_file = os.path.join(account_dir, 'security-groups.yaml')
+        Path(sg_file).write_text("account_id: '100000000007'\n security_groups: [\n")
+        summary = SecurityGroupValidator(account_dir).validate()
+        assert [e.rule for e in summary.errors] == ['yaml_syntax']
+        assert sg_file in summary.errors[0].message
+
+    def test_undeterminable_account_id(self, repo_root):
+        account_dir = os.path.join(repo_root, 'accounts', 'not-an-account')
+        os.makedirs(account_dir, exist_ok=True)
+        with pytest.raises(ValidationException):
+            SecurityGroupValidator(account_dir)
+
+    def test_unknown_top_level_key(self, compiled_validator):
+        data = {
+            'account_id': ACCOUNT_ID,
             'security_groups': {},
             'enviroment': 'prod',  # typo
         }
-        summary = _validate(repo_root, '100000000001', data)
-        rules = [e.rule for e in summary.errors]
-        assert 'schema_unknown_key' in rules
-        assert any('enviroment' in e.message for e in summary.errors)
-
-    def test_unknown_sg_key(self, repo_root):
-        data = {
-            'account_id': '100000000001',
-            'security_groups': {
-                'my-sg': {
-                    'description': 'test',
-                    'ingresss': [],  # typo
-                },
-            },
-        }
-        summary = _validate(repo_root, '100000000001', data)
-        rules = [e.rule for e in summary.errors]
-        assert 'schema_unknown_sg_key' in rules
-
-    def test_unknown_rule_key(self, repo_root):
-        data = {
-            'account_id': '100000000001',
-            'security_groups': {
-                'my-sg': {
-                    'description': 'test',
-                    'ingress': [{
-                        'protocol': 'tcp',
-                        'from_port': 443,
-                        'to_port': 443,
-                        'cidr_blocks': ['10.0.0.0/24'],
-                        'descriptin': 'typo',  # typo
-                    }],
-                },
-            },
-        }
-        summary = _validate(repo_root, '100000000001', data)
-        rules = [e.rule for e in summary.errors]
-        assert 'schema_unknown_rule_key' in rules
+        summary = compiled_validator(ACCOUNT_ID, data)
+        unknown_key_errors = summary.errors_by_rule.get('schema_unknown_key', [])
+        assert unknown_key_errors
+        assert any('enviroment' in e.message for e in unknown_key_errors)
 
 
 # ============================================================
 # Environment validation tests
 # ============================================================
 
+# Every rule the environment checks can report
+_ENV_RULES = frozenset({'schema_invalid_environment', 'schema_environment_type'})
+
+
 class TestEnvironmentValidation:
-    def test_valid_environments(self, repo_root):
-        for env in ['prod', 'test', 'dev']:
-            data = {
-                'account_id': '100000000001',
-                'environment': env,
-                'security_groups': {},
-            }
-            summary = _validate(repo_root, '100000000001', data)
-            env_errors = [e for e in summary.errors if e.rule and 'environment' in e.rule]
-            assert len(env_errors) == 0, f"'{env}' should be valid"
-
-    def test_invalid_environment(self, repo_root):
+    @pytest.mark.parametrize('env', ['prod', 'test', 'dev'])
+    def test_valid_environments(self, compiled_validator, env):
         data = {
-            'account_id': '100000000001',
-            'environment': 'production',  # should be 'prod'
+            'account_id': ACCOUNT_ID,
+            'environment': env,
             'security_groups': {},
         }
-        summary = _validate(repo_root, '100000000001', data)
-        rules = [e.rule for e in summary.errors]
-        assert 'schema_invalid_environment' in rules
+        summary = compiled_validator(ACCOUNT_ID, data)
+        assert not (summary.errors_by_rule.keys() & _ENV_RULES), f"'{env}' should be valid"
 
-    def test_environment_wrong_type(self, repo_root):
+    @pytest.mark.parametrize('env, rule', [
+        ('production', 'schema_invalid_environment'),  # should be 'prod'
+        (123, 'schema_environment_type'),
+    ], ids=['invalid_environment', 'environment_wrong_type'])
+    def test_invalid_environment(self, compiled_validator, env, rule):
         data = {
-            'account_id': '100000000001',
-            'environment': 123,
+            'account_id': ACCOUNT_ID,
+            'environment': env,
             'security_groups': {},
         }
-        summary = _validate(repo_root, '100000000001', data)
-        rules = [e.rule for e in summary.errors]
-        assert 'schema_environment_type' in rules
+        summary = compiled_validator(ACCOUNT_ID, data)
+        rules = _rule_set(summary)
+        assert rule in rules
+        assert rules & _ENV_RULES == {rule}
 
 
 # ============================================================
@@ -179,61 +239,26 @@ class TestEnvironmentValidation:
 # ============================================================
 
 class TestDuplicateRules:
-    def test_duplicate_ingress_rules(self, repo_root):
-        rule = {
-            'protocol': 'tcp',
-            'from_port': 443,
-            'to_port': 443,
-            'cidr_blocks': ['10.0.0.0/24'],
-        }
-        data = {
-            'account_id': '100000000001',
-            'security_groups': {
-                'my-sg': {
-                    'description': 'test',
-                    'ingress': [rule, rule],
-                },
-            },
-        }
-        summary = _validate(repo_root, '100000000001', data)
-        rules = [e.rule for e in summary.errors]
+    def test_duplicate_ingress_rules(self, compiled_validator):
+        data = _make_data(ingress=[_BASE_RULE_TCP_443, _BASE_RULE_TCP_443])
+        summary = compiled_validator(ACCOUNT_ID, data)
+        rules = _rule_set(summary)
         assert 'rule_duplicate' in rules
 
-    def test_no_false_positive_duplicates(self, repo_root):
-        data = {
-            'account_id': '100000000001',
-            'security_groups': {
-                'my-sg': {
-                    'description': 'test',
-                    'ingress': [
-                        {'protocol': 'tcp', 'from_port': 443, 'to_port': 443, 'cidr_blocks': ['10.0.0.0/24']},
-                        {'protocol': 'tcp', 'from_port': 8080, 'to_port': 8080, 'cidr_blocks': ['10.0.0.0/24']},
-                    ],
-                },
-            },
-        }
-        summary = _validate(repo_root, '100000000001', data)
-        dup_errors = [e for e in summary.errors if e.rule == 'rule_duplicate']
+    def test_no_false_positive_duplicates(self, compiled_validator):
+        data = _make_data(ingress=[
+            _BASE_RULE_TCP_443,
+            {**_BASE_RULE_TCP_443, 'from_port': 8080, 'to_port': 8080},
+        ])
+        summary = compiled_validator(ACCOUNT_ID, data)
+        dup_errors = summary.errors_by_rule.get('rule_duplicate', [])
         assert len(dup_errors) == 0
 
-    def test_duplicate_egress_rules(self, repo_root):
-        rule = {
-            'protocol': 'tcp',
-            'from_port': 443,
-            'to_port': 443,
-            'cidr_blocks': ['0.0.0.0/0'],
-        }
-        data = {
-            'account_id': '100000000001',
-            'security_groups': {
-                'my-sg': {
-                    'description': 'test',
-                    'egress': [rule, rule],
-                },
-            },
-        }
-        summary = _validate(repo_root, '100000000001', data)
-        dup_errors = [e for e in summary.errors if e.rule == 'rule_duplicate']
+    def test_duplicate_egress_rules(self, compiled_validator):
+        rule = {**_TCP_443, 'cidr_blocks': ['0.0.0.0/0']}
+        data = _make_data(egress=[rule, rule])
+        summary = compiled_validator(ACCOUNT_ID, data)
+        dup_errors = summary.errors_by_rule.get('rule_duplicate', [])
         assert len(dup_errors) == 1
 
 
@@ -242,64 +267,23 @@ class TestDuplicateRules:
 # ============================================================
 
 class TestCidrTypeValidation:
-    def test_bare_string_cidr(self, repo_root):
-        data = {
-            'account_id': '100000000001',
-            'security_groups': {
-                'my-sg': {
-                    'description': 'test',
-                    'ingress': [{
-                        'protocol': 'tcp',
-                        'from_port': 443,
-                        'to_port': 443,
-                        'cidr_blocks': '10.0.0.0/24',  # bare string, not list
-                    }],
-                },
-            },
-        }
-        summary = _validate(repo_root, '100000000001', data)
-        rules = [e.rule for e in summary.errors]
+    def test_bare_string_cidr(self, compiled_validator):
+        data = _make_data(ingress=[{**_TCP_443, 'cidr_blocks': '10.0.0.0/24'}])  # bare string, not list
+        summary = compiled_validator(ACCOUNT_ID, data)
+        rules = _rule_set(summary)
         assert 'rule_cidr_type' in rules
         # Should still validate the CIDR itself
-        assert not any(e.rule == 'rule_invalid_cidr' for e in summary.errors)
+        assert 'rule_invalid_cidr' not in rules
 
-    def test_cidr_wrong_type(self, repo_root):
-        data = {
-            'account_id': '100000000001',
-            'security_groups': {
-                'my-sg': {
-                    'description': 'test',
-                    'ingress': [{
-                        'protocol': 'tcp',
-                        'from_port': 443,
-                        'to_port': 443,
-                        'cidr_blocks': 12345,  # number
-                    }],
-                },
-            },
-        }
-        summary = _validate(repo_root, '100000000001', data)
-        rules = [e.rule for e in summary.errors]
-        assert 'rule_cidr_type' in rules
-
-    def test_cidr_list_item_wrong_type(self, repo_root):
-        data = {
-            'account_id': '100000000001',
-            'security_groups': {
-                'my-sg': {
-                    'description': 'test',
-                    'ingress': [{
-                        'protocol': 'tcp',
-                        'from_port': 443,
-                        'to_port': 443,
-                        'cidr_blocks': [10],  # number in list
-                    }],
-                },
-            },
-        }
-        summary = _validate(repo_root, '100000000001', data)
-        rules = [e.rule for e in summary.errors]
-        assert 'rule_cidr_item_type' in rules
+    @pytest.mark.parametrize('cidr_blocks, expected', [
+        (12345, 'rule_cidr_type'),  # number
+        ([10], 'rule_cidr_item_type'),  # number in list
+    ], ids=['cidr_wrong_type', 'cidr_list_item_wrong_type'])
+    def test_cidr_wrong_type(self, compiled_validator, cidr_blocks, expected):
+        data = _make_data(ingress=[{**_TCP_443, 'cidr_blocks': cidr_blocks}])
+        summary = compiled_validator(ACCOUNT_ID, data)
+        rules = _rule_set(summary)
+        assert expected in rules
 
 
 # ============================================================
@@ -307,42 +291,16 @@ class TestCidrTypeValidation:
 # ============================================================
 
 class TestSelfFieldValidation:
-    def test_self_wrong_type(self, repo_root):
-        data = {
-            'account_id': '100000000001',
-            'security_groups': {
-                'my-sg': {
-                    'description': 'test',
-                    'ingress': [{
-                        'protocol': 'tcp',
-                        'from_port': 443,
-                        'to_port': 443,
-                        'self': 'yes',  # should be bool
-                    }],
-                },
-            },
-        }
-        summary = _validate(repo_root, '100000000001', data)
-        rules = [e.rule for e in summary.errors]
+    def test_self_wrong_type(self, compiled_validator):
+        data = _make_data(ingress=[{**_TCP_443, 'self': 'yes'}])  # should be bool
+        summary = compiled_validator(ACCOUNT_ID, data)
+        rules = _rule_set(summary)
         assert 'rule_self_type' in rules
 
-    def test_self_valid_bool(self, repo_root):
-        data = {
-            'account_id': '100000000001',
-            'security_groups': {
-                'my-sg': {
-                    'description': 'test',
-                    'ingress': [{
-                        'protocol': 'tcp',
-                        'from_port': 443,
-                        'to_port': 443,
-                        'self': True,
-                    }],
-                },
-            },
-        }
-        summary = _validate(repo_root, '100000000001', data)
-        self_errors = [e for e in summary.errors if e.rule == 'rule_self_type']
+    def test_self_valid_bool(self, compiled_validator):
+        data = _make_data(ingress=[{**_TCP_443, 'self': True}])
+        summary = compiled_validator(ACCOUNT_ID, data)
+        self_errors = summary.errors_by_rule.get('rule_self_type', [])
         assert len(self_errors) == 0
 
 
@@ -351,77 +309,74 @@ class TestSelfFieldValidation:
 # ============================================================
 
 class TestEmptyRuleLists:
-    def test_empty_ingress(self, repo_root):
-        data = {
-            'account_id': '100000000001',
-            'security_groups': {
-                'my-sg': {
-                    'description': 'test',
-                    'ingress': [],
-                },
-            },
-        }
-        summary = _validate(repo_root, '100000000001', data)
-        warn_rules = [w.rule for w in summary.warnings]
+    def test_empty_ingress(self, compiled_validator):
+        data = _make_data(ingress=[])
+        summary = compiled_validator(ACCOUNT_ID, data)
+        warn_rules = _warn_rule_set(summary)
         assert 'sg_empty_rules' in warn_rules
 
-    def test_empty_egress(self, repo_root):
-        data = {
-            'account_id': '100000000001',
-            'security_groups': {
-                'my-sg': {
-                    'description': 'test',
-                    'egress': [],
-                },
-            },
-        }
-        summary = _validate(repo_root, '100000000001', data)
-        warn_rules = [w.rule for w in summary.warnings]
+    def test_empty_egress(self, compiled_validator):
+        data = _make_data(egress=[])
+        summary = compiled_validator(ACCOUNT_ID, data)
+        warn_rules = _warn_rule_set(summary)
         assert 'sg_empty_rules' in warn_rules
 
+    def test_null_ingress(self, compiled_validator):
+        data = _make_data(ingress=None)
+        summary = compiled_validator(ACCOUNT_ID, data)
+        rules = _rule_set(summary)
+        assert 'sg_ingress_type' in rules
+
+
+# ============================================================
+# Prefix list reference tests
+# ============================================================
+
+class TestPrefixListReferences:
+    def _data(self, prefix_list_ids):
+        return _make_data(ingress=[{**_TCP_443, 'prefix_list_ids': prefix_list_ids}])
+
+    def test_known_prefix_list(self, compiled_validator):
+        summary = compiled_validator(ACCOUNT_ID, self._data(['corporate-networks']))
+        assert not summary.has_errors
+
+    def test_undefined_prefix_list(self, compiled_validator):
+        summary = compiled_validator(ACCOUNT_ID, self._data(['no-such-list']))
+        rules = _rule_set(summary)
+        assert 'rule_undefined_prefix_list' in rules
+        assert 'undefined_prefix_list_reference' in rules
+
+    def test_aws_managed_prefix_list(self, compiled_validator):
+        summary = compiled_validator(ACCOUNT_ID, self._data(['pl-0123456789abcdef0']))
+        assert not summary.has_errors
+        assert 'rule_aws_prefix_list' in [i.rule for i in summary.info]
+
 
 # ============================================================
 # Ref type validation tests
 # ============================================================
 
 class TestRefTypeValidation:
-    def test_security_groups_ref_wrong_type(self, repo_root):
-        data = {
-            'account_id': '100000000001',
-            'security_groups': {
-                'my-sg': {
-                    'description': 'test',
-                    'ingress': [{
-                        'protocol': 'tcp',
-                        'from_port': 443,
-                        'to_port': 443,
-                        'security_groups': 'sg-12345',  # should be list
-                    }],
-                },
-            },
-        }
-        summary = _validate(repo_root, '100000000001', data)
-        rules = [e.rule for e in summary.errors]
-        assert 'rule_sg_ref_type' in rules
-
-    def test_prefix_list_ref_wrong_type(self, repo_root):
-        data = {
-            'account_id': '100000000001',
-            'security_groups': {
-                'my-sg': {
-                    'description': 'test',
-                    'ingress': [{
-                        'protocol': 'tcp',
-                        'from_port': 443,
-                        'to_port': 443,
-                        'prefix_list_ids': 'corporate-networks',  # should be list
-                    }],
-                },
-            },
-        }
-        summary = _validate(repo_root, '100000000001', data)
-        rules = [e.rule for e in summary.errors]
-        assert 'rule_prefix_list_type' in rules
+    @pytest.mark.parametrize('field, value, expected', [
+        ('security_groups', 'sg-12345', 'rule_sg_ref_type'),  # should be list
+        ('prefix_list_ids', 'corporate-networks', 'rule_prefix_list_type'),  # should be list
+    ], ids=['security_groups_ref_wrong_type', 'prefix_list_ref_wrong_type'])
+    def test_ref_wrong_type(self, compiled_validator, field, value, expected):
+        data = _make_data(ingress=[{**_TCP_443, field: value}])
+        summary = compiled_validator(ACCOUNT_ID, data)
+        rules = _rule_set(summary)
+        assert expected in rules
+
+    def test_security_groups_ref_format(self, compiled_validator):
+        data = _make_data(ingress=[{
+            **_TCP_443,
+            'security_groups': ['sg-0123456789abcdef0', 'app-backend', '-leading-dash', 'has space'],
+        }])
+        summary = compiled_validator(ACCOUNT_ID, data)
+        flagged = [w.message for w in summary.warnings if w.rule == 'rule_sg_reference_format']
+        assert len(flagged) == 2
+        assert "'-leading-dash'" in flagged[0]
+        assert "'has space'" in flagged[1]
 
 
 # ============================================================
@@ -429,9 +384,9 @@ class TestRefTypeValidation:
 # ============================================================
 
 class TestCleanPass:
-    def test_valid_config_no_errors(self, repo_root):
+    def test_valid_config_no_errors(self, compiled_validator):
         data = {
-            'account_id': '100000000001',
+            'account_id': ACCOUNT_ID,
             'environment': 'prod',
             'security_groups': {
                 'web-app-sg': {
@@ -457,7 +412,7 @@ class TestCleanPass:
                 },
             },
         }
-        summary = _validate(repo_root, '100000000001', data)
+        summary = compiled_validator(ACCOUNT_ID, data)
         assert not summary.has_errors, f"Expected no errors, got: {[e.message for e in summary.errors]}"
         assert summary.get_exit_code() == 0
 
@@ -467,81 +422,137 @@ class TestCleanPass:
 # ============================================================
 
 class TestGuardrails:
-    def test_blocked_port(self, repo_root):
-        data = {
-            'account_id': '100000000001',
-            'security_groups': {
-                'my-sg': {
-                    'description': 'test',
-                    'ingress': [{
-                        'protocol': 'tcp',
-                        'from_port': 23,
-                        'to_port': 23,
-                        'cidr_blocks': ['10.0.0.0/24'],
-                    }],
-                },
-            },
-        }
-        summary = _validate(repo_root, '100000000001', data)
-        rules = [e.rule for e in summary.errors]
+    def test_repo_root_env_override(self, repo_root, tmp_path, monkeypatch):
+        account_dir = tmp_path / ACCOUNT_ID
+        account_dir.mkdir()
+        (account_dir / 'security-groups.yaml').write_text(yaml.dump({'account_id': ACCOUNT_ID, 'security_groups': {}}, Dumper=_YamlDumper))
+        monkeypatch.setenv('SG_REPO_ROOT', repo_root)
+        validator = SecurityGroupValidator(str(account_dir))
+        assert str(validator.repo_root) == os.path.realpath(repo_root)
+
+    def test_guardrails_cached_until_modified(self, fresh_repo_root):
+        repo_root = fresh_repo_root
+        dir_a = _write_sg_yaml(repo_root, ACCOUNT_ID, {'account_id': ACCOUNT_ID, 'security_groups': {}})
+        dir_b = _write_sg_yaml(repo_root, '100000000002', {'account_id': '100000000002', 'security_groups': {}})
+        first = SecurityGroupValidator(dir_a)
+        assert SecurityGroupValidator(dir_b).guardrails is first.guardrails
+
+        guardrails_path = os.path.join(repo_root, 'guardrails.yaml')
+        # No mtime faking needed: the new content has a different size
+        with open(guardrails_path, 'w') as f:
+            yaml.dump({'validation': {'blocked_ports': [22]}}, f, Dumper=_YamlDumper)
+        reloaded = SecurityGroupValidator(dir_a)
+        assert reloaded.guardrails['validation']['blocked_ports'] == [22]
+        # The path's single cache entry was replaced, not added to
+        assert SecurityGroupValidator._CONFIG_CACHE[first.repo_root / 'guardrails.yaml'][1] is reloaded.guardrails
+
+    def test_empty_guardrails_is_a_validation_error(self, fresh_repo_root):
+        Path(fresh_repo_root, 'guardrails.yaml').write_text('')
+        account_dir = _write_sg_yaml(fresh_repo_root, ACCOUNT_ID, {'account_id': ACCOUNT_ID, 'security_groups': {}})
+        with pytest.raises(ValidationException, match='guardrails.yaml must be a mapping'):
+            SecurityGroupValidator(account_dir)
+        report, error, exit_code = _run_account(_parse_args([account_dir]), account_dir)
+        assert (report, error, exit_code) == (None, 'guardrails.yaml must be a mapping', 1)
+
+    def test_from_dicts_matches_file_validation(self, repo_root, compiled_validator):
+        data = {
+            'account_id': '100000000009',
+            'security_groups': {
+                'my-sg': {
+                    'description': 'test',
+                    'ingress': [{'protocol': 'tcp', 'from_port': 23, 'to_port': 23, 'cidr_blocks': ['10.0.0.0/24']}],
+                },
+            },
+        }
+        from_file = SecurityGroupValidator(_write_sg_yaml(repo_root, '100000000008', data)).validate()
+        in_memory = compiled_validator('100000000008', data)
+        assert [r.format_text() for r in in_memory.errors + in_memory.warnings] == \
+            [r.format_text() for r in from_file.errors + from_file.warnings]
+        assert 'account_id_consistency' in [w.rule for w in in_memory.warnings]
+
+    def test_blocked_port(self, compiled_validator):
+        data = _make_data(
+            ingress=[{
+                'protocol': 'tcp',
+                'from_port': 23,
+                'to_port': 23,
+                'cidr_blocks': ['10.0.0.0/24'],
+            }],
+        )
+        summary = compiled_validator(ACCOUNT_ID, data)
+        rules = _rule_set(summary)
         assert 'rule_blocked_port' in rules
 
-    def test_quad_zero_ingress_blocked(self, repo_root):
-        data = {
-            'account_id': '100000000001',
-            'security_groups': {
-                'my-sg': {
-                    'description': 'test',
-                    'ingress': [{
-                        'protocol': 'tcp',
-                        'from_port': 443,
-                        'to_port': 443,
-                        'cidr_blocks': ['0.0.0.0/0'],
-                    }],
-                },
-            },
-        }
-        summary = _validate(repo_root, '100000000001', data)
-        rules = [e.rule for e in summary.errors]
+    def test_quad_zero_ingress_blocked(self, compiled_validator):
+        data = _make_data(ingress=[{**_TCP_443, 'cidr_blocks': ['0.0.0.0/0']}])
+        summary = compiled_validator(ACCOUNT_ID, data)
+        rules = _rule_set(summary)
         assert 'rule_blocked_cidr' in rules or 'rule_open_internet' in rules
 
-    def test_broad_port_range(self, repo_root):
-        data = {
-            'account_id': '100000000001',
-            'security_groups': {
-                'my-sg': {
-                    'description': 'test',
-                    'ingress': [{
-                        'protocol': 'tcp',
-                        'from_port': 0,
-                        'to_port': 65535,
-                        'cidr_blocks': ['10.0.0.0/24'],
-                    }],
-                },
-            },
-        }
-        summary = _validate(repo_root, '100000000001', data)
-        rules = [e.rule for e in summary.errors]
+    def test_broad_port_range(self, compiled_validator):
+        data = _make_data(
+            ingress=[{
+                'protocol': 'tcp',
+                'from_port': 0,
+                'to_port': 65535,
+                'cidr_blocks': ['10.0.0.0/24'],
+            }],
+        )
+        summary = compiled_validator(ACCOUNT_ID, data)
+        rules = _rule_set(summary)
         assert 'rule_port_range_too_large' in rules
 
-    def test_high_risk_ssh_from_cidr(self, repo_root):
+    def test_blocked_ports_inside_wide_range(self, compiled_validator):
+        data = _make_data(
+            ingress=[{
+                'protocol': 'tcp',
+                'from_port': 0,
+                'to_port': 65535,
+                'cidr_blocks': ['10.0.0.0/24'],
+            }],
+        )
+        summary = compiled_validator(ACCOUNT_ID, data)
+        blocked = [e.message for e in summary.errors if e.rule == 'rule_blocked_port']
+        assert len(blocked) == 4
+        assert [m.split()[2] for m in blocked] == ['23', '135', '139', '445']
+
+    def test_high_risk_ssh_from_cidr(self, compiled_validator):
+        data = _make_data(
+            ingress=[{
+                'protocol': 'tcp',
+                'from_port': 22,
+                'to_port': 22,
+                'cidr_blocks': ['10.0.0.0/24'],
+            }],
+        )
+        summary = compiled_validator(ACCOUNT_ID, data)
+        warn_rules = _warn_rule_set(summary)
+        assert 'high_risk_pattern' in warn_rules
+
+    def test_warnings_not_recorded(self, compiled_validator):
+        data = _make_data(
+            ingress=[{
+                'protocol': 'tcp',
+                'from_port': 22,
+                'to_port': 23,
+                'cidr_blocks': ['10.0.0.0/8'],
+            }],
+        )
+        summary = compiled_validator(ACCOUNT_ID, data, record_warnings=False)
+        assert summary.warnings == []
+        assert [e.rule for e in summary.errors] == ['rule_blocked_port']
+
+    def test_reserved_name_prefix(self, compiled_validator):
         data = {
-            'account_id': '100000000001',
+            'account_id': ACCOUNT_ID,
             'security_groups': {
-                'my-sg': {
-                    'description': 'test',
-                    'ingress': [{
-                        'protocol': 'tcp',
-                        'from_port': 22,
-                        'to_port': 22,
-                        'cidr_blocks': ['10.0.0.0/24'],
-                    }],
-                },
+                'aws-managed': {'description': 'test', 'egress': []},
+                'my-aws-sg': {'description': 'test', 'egress': []},
             },
         }
-        summary = _validate(repo_root, '100000000001', data)
-        warn_rules = [w.rule for w in summary.warnings]
-        assert 'high_risk_pattern' in warn_rules
+        summary = compiled_validator(ACCOUNT_ID, data)
+        reserved = [w.message for w in summary.warnings if w.rule == 'naming_reserved_pattern']
+        assert reserved == ["Security group name 'aws-managed' starts with reserved pattern 'aws-'"]
 
 
 # ============================================================
@@ -550,10 +561,10 @@ class TestGuardrails:
 # ============================================================
 
 class TestUnicodeCharacterValidation:
-    def test_ascii_values_pass(self, repo_root):
+    def test_ascii_values_pass(self, compiled_validator):
         """Normal ASCII values should not trigger unicode errors."""
         data = {
-            'account_id': '100000000001',
+            'account_id': ACCOUNT_ID,
             'security_groups': {
                 'web-app-sg': {
                     'description': 'Web application security group',
@@ -577,14 +588,14 @@ class TestUnicodeCharacterValidation:
                 },
             },
         }
-        summary = _validate(repo_root, '100000000001', data)
-        unicode_errors = [e for e in summary.errors if e.rule == 'unicode_character']
+        summary = compiled_validator(ACCOUNT_ID, data)
+        unicode_errors = summary.errors_by_rule.get('unicode_character', [])
         assert len(unicode_errors) == 0
 
-    def test_unicode_in_sg_name(self, repo_root):
+    def test_unicode_in_sg_name(self, compiled_validator):
         """Unicode characters in SG names should be rejected."""
         data = {
-            'account_id': '100000000001',
+            'account_id': ACCOUNT_ID,
             'security_groups': {
                 'wéb-app-sg': {
                     'description': 'test',
@@ -597,15 +608,15 @@ class TestUnicodeCharacterValidation:
                 },
             },
         }
-        summary = _validate(repo_root, '100000000001', data)
-        unicode_errors = [e for e in summary.errors if e.rule == 'unicode_character']
+        summary = compiled_validator(ACCOUNT_ID, data)
+        unicode_errors = summary.errors_by_rule.get('unicode_character', [])
         assert len(unicode_errors) >= 1
         assert any('name' in e.context for e in unicode_errors)
 
-    def test_zero_width_chars_in_description(self, repo_root):
+    def test_zero_width_chars_in_description(self, compiled_validator):
         """Zero-width characters in descriptions should be caught."""
         data = {
-            'account_id': '100000000001',
+            'account_id': ACCOUNT_ID,
             'security_groups': {
                 'my-sg': {
                     'description': 'Web app \u200b security group',
@@ -618,73 +629,48 @@ class TestUnicodeCharacterValidation:
                 },
             },
         }
-        summary = _validate(repo_root, '100000000001', data)
-        unicode_errors = [e for e in summary.errors if e.rule == 'unicode_character']
+        summary = compiled_validator(ACCOUNT_ID, data)
+        unicode_errors = summary.errors_by_rule.get('unicode_character', [])
         assert len(unicode_errors) >= 1
         assert any('description' in e.context for e in unicode_errors)
 
-    def test_emoji_in_tag_values(self, repo_root):
+    def test_emoji_in_tag_values(self, compiled_validator):
         """Emoji in tag values should be caught."""
-        data = {
-            'account_id': '100000000001',
-            'security_groups': {
-                'my-sg': {
-                    'description': 'test',
-                    'tags': {'<company>-app-env': 'web-app 🚀'},
-                    'ingress': [{
-                        'protocol': 'tcp',
-                        'from_port': 443,
-                        'to_port': 443,
-                        'cidr_blocks': ['10.0.0.0/24'],
-                    }],
-                },
-            },
-        }
-        summary = _validate(repo_root, '100000000001', data)
-        unicode_errors = [e for e in summary.errors if e.rule == 'unicode_character']
+        data = _make_data(
+            tags={'<company>-app-env': 'web-app 🚀'},
+            ingress=[{
+                'protocol': 'tcp',
+                'from_port': 443,
+                'to_port': 443,
+                'cidr_blocks': ['10.0.0.0/24'],
+            }],
+        )
+        summary = compiled_validator(ACCOUNT_ID, data)
+        unicode_errors = summary.errors_by_rule.get('unicode_character', [])
         assert len(unicode_errors) >= 1
         assert any('tags' in e.context for e in unicode_errors)
 
-    def test_accented_chars_in_cidr(self, repo_root):
+    def test_accented_chars_in_cidr(self, compiled_validator):
         """Accented characters in CIDR values should be caught."""
-        data = {
-            'account_id': '100000000001',
-            'security_groups': {
-                'my-sg': {
-                    'description': 'test',
-                    'ingress': [{
-                        'protocol': 'tcp',
-                        'from_port': 443,
-                        'to_port': 443,
-                        'cidr_blocks': ['10.0.0.0/²4'],
-                    }],
-                },
-            },
-        }
-        summary = _validate(repo_root, '100000000001', data)
-        unicode_errors = [e for e in summary.errors if e.rule == 'unicode_character']
+        data = _make_data(ingress=[{**_TCP_443, 'cidr_blocks': ['10.0.0.0/²4']}])
+        summary = compiled_validator(ACCOUNT_ID, data)
+        unicode_errors = summary.errors_by_rule.get('unicode_character', [])
         assert len(unicode_errors) >= 1
         assert any('cidr_blocks' in e.context for e in unicode_errors)
 
-    def test_unicode_in_rule_description(self, repo_root):
+    def test_unicode_in_rule_description(self, compiled_validator):
         """Unicode in rule descriptions should be caught."""
-        data = {
-            'account_id': '100000000001',
-            'security_groups': {
-                'my-sg': {
-                    'description': 'test',
-                    'ingress': [{
-                        'protocol': 'tcp',
-                        'from_port': 443,
-                        'to_port': 443,
-                        'cidr_blocks': ['10.0.0.0/24'],
-                        'description': 'Allow HTTPS \u2014 secure',
-                    }],
-                },
-            },
-        }
-        summary = _validate(repo_root, '100000000001', data)
-        unicode_errors = [e for e in summary.errors if e.rule == 'unicode_character']
+        data = _make_data(
+            ingress=[{
+                'protocol': 'tcp',
+                'from_port': 443,
+                'to_port': 443,
+                'cidr_blocks': ['10.0.0.0/24'],
+                'description': 'Allow HTTPS \u2014 secure',
+            }],
+        )
+        summary = compiled_validator(ACCOUNT_ID, data)
+        unicode_errors = summary.errors_by_rule.get('unicode_character', [])
         assert len(unicode_errors) >= 1
 
 
@@ -706,110 +692,63 @@ NEW_CORPORATE_TAGS = {
 CORPORATE_TAG_KEYS = list(NEW_CORPORATE_TAGS.keys())
 
 
-@pytest.fixture
-def repo_root_with_tags():
+@pytest.fixture(scope="module")
+def repo_root_with_tags(tmp_path_factory):
     """Create a temporary repo root with corporate mandatory tag enforcement."""
-    tmpdir = tempfile.mkdtemp()
-
-    guardrails = {
-        'validation': {
-            'blocked_cidrs': ['0.0.0.0/0', '::/0'],
-            'blocked_ports': [23, 135, 139, 445],
-            'port_ranges': {'max_range_size': 1000},
-            'rules': {
-                'max_ingress_rules': 60,
-                'max_egress_rules': 60,
-            },
-            'naming': {
-                'security_group_pattern': r'^[a-z0-9][a-z0-9-]*[a-z0-9]$',
-                'max_name_length': 63,
-                'required_tags': CORPORATE_TAG_KEYS,
-            },
-        },
-        'type_overrides': {},
-    }
+    return _create_repo_root(str(tmp_path_factory.mktemp("repo_with_tags")), CORPORATE_TAG_KEYS)
 
-    prefix_lists = {
-        'prefix_lists': {
-            'corporate-networks': {
-                'description': 'Corporate office CIDRs',
-                'entries': ['10.100.0.0/16'],
-            },
-        },
-    }
-
-    with open(os.path.join(tmpdir, 'guardrails.yaml'), 'w') as f:
-        yaml.dump(guardrails, f)
-    with open(os.path.join(tmpdir, 'prefix-lists.yaml'), 'w') as f:
-        yaml.dump(prefix_lists, f)
 
-    yield tmpdir
-    shutil.rmtree(tmpdir)
+@pytest.fixture(scope="module")
+def tagged_validator(repo_root_with_tags):
+    """validate(account_id, data, **kwargs) with corporate mandatory tags enforced."""
+    return _build_validator(repo_root_with_tags)
 
 
 class TestCorporateMandatoryTags:
-    def test_missing_all_tags_gives_errors(self, repo_root_with_tags):
-        data = {
-            'account_id': '100000000001',
-            'security_groups': {
-                'my-sg': {
-                    'description': 'test',
-                    'tags': {},
-                    'ingress': [{
-                        'protocol': 'tcp',
-                        'from_port': 443,
-                        'to_port': 443,
-                        'cidr_blocks': ['10.0.0.0/24'],
-                    }],
-                },
-            },
-        }
-        summary = _validate(repo_root_with_tags, '100000000001', data)
-        tag_errors = [e for e in summary.errors if e.rule == 'sg_required_tags']
+    def test_missing_all_tags_gives_errors(self, tagged_validator):
+        data = _make_data(
+            tags={},
+            ingress=[{
+                'protocol': 'tcp',
+                'from_port': 443,
+                'to_port': 443,
+                'cidr_blocks': ['10.0.0.0/24'],
+            }],
+        )
+        summary = tagged_validator(ACCOUNT_ID, data)
+        tag_errors = summary.errors_by_rule.get('sg_required_tags', [])
         assert len(tag_errors) == 8, f"Expected 8 missing tag errors, got {len(tag_errors)}"
 
-    def test_all_corporate_tags_present_passes(self, repo_root_with_tags):
-        data = {
-            'account_id': '100000000001',
-            'security_groups': {
-                'my-sg': {
-                    'description': 'test',
-                    'tags': NEW_CORPORATE_TAGS,
-                    'ingress': [{
-                        'protocol': 'tcp',
-                        'from_port': 443,
-                        'to_port': 443,
-                        'cidr_blocks': ['10.0.0.0/24'],
-                    }],
-                },
-            },
-        }
-        summary = _validate(repo_root_with_tags, '100000000001', data)
-        tag_errors = [e for e in summary.errors if e.rule == 'sg_required_tags']
+    def test_all_corporate_tags_present_passes(self, tagged_validator):
+        data = _make_data(
+            tags=NEW_CORPORATE_TAGS,
+            ingress=[{
+                'protocol': 'tcp',
+                'from_port': 443,
+                'to_port': 443,
+                'cidr_blocks': ['10.0.0.0/24'],
+            }],
+        )
+        summary = tagged_validator(ACCOUNT_ID, data)
+        tag_errors = summary.errors_by_rule.get('sg_required_tags', [])
         assert len(tag_errors) == 0
 
-    def test_partial_corporate_tags_gives_errors(self, repo_root_with_tags):
+    def test_partial_corporate_tags_gives_errors(self, tagged_validator):
         partial_tags = {
             "<company>-app-env": "prod",
             "<company>-data-classification": "internal",
         }
-        data = {
-            'account_id': '100000000001',
-            'security_groups': {
-                'my-sg': {
-                    'description': 'test',
-                    'tags': partial_tags,
-                    'ingress': [{
-                        'protocol': 'tcp',
-                        'from_port': 443,
-                        'to_port': 443,
-                        'cidr_blocks': ['10.0.0.0/24'],
-                    }],
-                },
-            },
-        }
-        summary = _validate(repo_root_with_tags, '100000000001', data)
-        tag_errors = [e for e in summary.errors if e.rule == 'sg_required_tags']
+        data = _make_data(
+            tags=partial_tags,
+            ingress=[{
+                'protocol': 'tcp',
+                'from_port': 443,
+                'to_port': 443,
+                'cidr_blocks': ['10.0.0.0/24'],
+            }],
+        )
+        summary = tagged_validator(ACCOUNT_ID, data)
+        tag_errors = summary.errors_by_rule.get('sg_required_tags', [])
         assert len(tag_errors) == 6
 
 
@@ -818,157 +757,109 @@ class TestCorporateMandatoryTags:
 # ============================================================
 
 class TestRuleShadowing:
-    def test_cidr_supernet_shadows_subnet(self, repo_root):
+    def test_cidr_supernet_shadows_subnet(self, compiled_validator):
         """A /16 rule shadows a /24 rule on the same port."""
-        data = {
-            'account_id': '100000000001',
-            'security_groups': {
-                'my-sg': {
-                    'description': 'test',
-                    'ingress': [
-                        {'protocol': 'tcp', 'from_port': 443, 'to_port': 443, 'cidr_blocks': ['10.0.0.0/16']},
-                        {'protocol': 'tcp', 'from_port': 443, 'to_port': 443, 'cidr_blocks': ['10.0.1.0/24']},
-                    ],
-                },
-            },
-        }
-        summary = _validate(repo_root, '100000000001', data)
-        shadow_warnings = [w for w in summary.warnings if w.rule == 'rule_shadowed']
+        data = _make_data(
+            ingress=[
+                {'protocol': 'tcp', 'from_port': 443, 'to_port': 443, 'cidr_blocks': ['10.0.0.0/16']},
+                {'protocol': 'tcp', 'from_port': 443, 'to_port': 443, 'cidr_blocks': ['10.0.1.0/24']},
+            ],
+        )
+        summary = compiled_validator(ACCOUNT_ID, data)
+        shadow_warnings = summary.warnings_by_rule.get('rule_shadowed', [])
         assert len(shadow_warnings) == 1
         assert '[1]' in shadow_warnings[0].message  # the /24 rule at index 1 is shadowed
 
-    def test_broad_port_range_shadows_narrow(self, repo_root):
+    def test_broad_port_range_shadows_narrow(self, compiled_validator):
         """A rule with ports 80-8080 shadows a rule with port 443 on the same CIDR."""
-        data = {
-            'account_id': '100000000001',
-            'security_groups': {
-                'my-sg': {
-                    'description': 'test',
-                    'ingress': [
-                        {'protocol': 'tcp', 'from_port': 80, 'to_port': 8080, 'cidr_blocks': ['10.0.0.0/24']},
-                        {'protocol': 'tcp', 'from_port': 443, 'to_port': 443, 'cidr_blocks': ['10.0.0.0/24']},
-                    ],
-                },
-            },
-        }
-        summary = _validate(repo_root, '100000000001', data)
-        shadow_warnings = [w for w in summary.warnings if w.rule == 'rule_shadowed']
+        data = _make_data(
+            ingress=[
+                {'protocol': 'tcp', 'from_port': 80, 'to_port': 8080, 'cidr_blocks': ['10.0.0.0/24']},
+                {'protocol': 'tcp', 'from_port': 443, 'to_port': 443, 'cidr_blocks': ['10.0.0.0/24']},
+            ],
+        )
+        summary = compiled_validator(ACCOUNT_ID, data)
+        shadow_warnings = summary.warnings_by_rule.get('rule_shadowed', [])
         assert len(shadow_warnings) == 1
 
-    def test_no_shadow_different_protocols(self, repo_root):
+    def test_no_shadow_different_protocols(self, compiled_validator):
         """TCP and UDP rules on same port/CIDR don't shadow each other."""
-        data = {
-            'account_id': '100000000001',
-            'security_groups': {
-                'my-sg': {
-                    'description': 'test',
-                    'ingress': [
-                        {'protocol': 'tcp', 'from_port': 443, 'to_port': 443, 'cidr_blocks': ['10.0.0.0/16']},
-                        {'protocol': 'udp', 'from_port': 443, 'to_port': 443, 'cidr_blocks': ['10.0.1.0/24']},
-                    ],
-                },
-            },
-        }
-        summary = _validate(repo_root, '100000000001', data)
-        shadow_warnings = [w for w in summary.warnings if w.rule == 'rule_shadowed']
+        data = _make_data(
+            ingress=[
+                {'protocol': 'tcp', 'from_port': 443, 'to_port': 443, 'cidr_blocks': ['10.0.0.0/16']},
+                {'protocol': 'udp', 'from_port': 443, 'to_port': 443, 'cidr_blocks': ['10.0.1.0/24']},
+            ],
+        )
+        summary = compiled_validator(ACCOUNT_ID, data)
+        shadow_warnings = summary.warnings_by_rule.get('rule_shadowed', [])
         assert len(shadow_warnings) == 0
 
-    def test_no_shadow_different_cidrs(self, repo_root):
+    def test_no_shadow_different_cidrs(self, compiled_validator):
         """Different non-overlapping CIDRs don't shadow."""
-        data = {
-            'account_id': '100000000001',
-            'security_groups': {
-                'my-sg': {
-                    'description': 'test',
-                    'ingress': [
-                        {'protocol': 'tcp', 'from_port': 443, 'to_port': 443, 'cidr_blocks': ['10.0.0.0/24']},
-                        {'protocol': 'tcp', 'from_port': 443, 'to_port': 443, 'cidr_blocks': ['10.1.0.0/24']},
-                    ],
-                },
-            },
-        }
-        summary = _validate(repo_root, '100000000001', data)
-        shadow_warnings = [w for w in summary.warnings if w.rule == 'rule_shadowed']
+        data = _make_data(
+            ingress=[
+                {'protocol': 'tcp', 'from_port': 443, 'to_port': 443, 'cidr_blocks': ['10.0.0.0/24']},
+                {'protocol': 'tcp', 'from_port': 443, 'to_port': 443, 'cidr_blocks': ['10.1.0.0/24']},
+            ],
+        )
+        summary = compiled_validator(ACCOUNT_ID, data)
+        shadow_warnings = summary.warnings_by_rule.get('rule_shadowed', [])
         assert len(shadow_warnings) == 0
 
-    def test_protocol_all_shadows_tcp(self, repo_root):
+    def test_protocol_all_shadows_tcp(self, compiled_validator):
         """Protocol 'all' shadows a TCP rule on the same CIDR."""
-        data = {
-            'account_id': '100000000001',
-            'security_groups': {
-                'my-sg': {
-                    'description': 'test',
-                    'egress': [
-                        {'protocol': 'all', 'cidr_blocks': ['10.0.0.0/16']},
-                        {'protocol': 'tcp', 'from_port': 443, 'to_port': 443, 'cidr_blocks': ['10.0.1.0/24']},
-                    ],
-                },
-            },
-        }
-        summary = _validate(repo_root, '100000000001', data)
-        shadow_warnings = [w for w in summary.warnings if w.rule == 'rule_shadowed']
+        data = _make_data(
+            egress=[
+                {'protocol': 'all', 'cidr_blocks': ['10.0.0.0/16']},
+                {'protocol': 'tcp', 'from_port': 443, 'to_port': 443, 'cidr_blocks': ['10.0.1.0/24']},
+            ],
+        )
+        summary = compiled_validator(ACCOUNT_ID, data)
+        shadow_warnings = summary.warnings_by_rule.get('rule_shadowed', [])
         assert len(shadow_warnings) == 1
 
-    def test_self_rule_shadowing(self, repo_root):
+    def test_self_rule_shadowing(self, compiled_validator):
         """A broader self rule shadows a narrower self rule."""
-        data = {
-            'account_id': '100000000001',
-            'security_groups': {
-                'my-sg': {
-                    'description': 'test',
-                    'ingress': [
-                        {'protocol': 'tcp', 'from_port': 0, 'to_port': 65535, 'self': True},
-                        {'protocol': 'tcp', 'from_port': 443, 'to_port': 443, 'self': True},
-                    ],
-                },
-            },
-        }
-        summary = _validate(repo_root, '100000000001', data)
-        shadow_warnings = [w for w in summary.warnings if w.rule == 'rule_shadowed']
+        data = _make_data(
+            ingress=[
+                {'protocol': 'tcp', 'from_port': 0, 'to_port': 65535, 'self': True},
+                {'protocol': 'tcp', 'from_port': 443, 'to_port': 443, 'self': True},
+            ],
+        )
+        summary = compiled_validator(ACCOUNT_ID, data)
+        shadow_warnings = summary.warnings_by_rule.get('rule_shadowed', [])
         assert len(shadow_warnings) == 1
 
-    def test_no_shadow_self_vs_cidr(self, repo_root):
+    def test_no_shadow_self_vs_cidr(self, compiled_validator):
         """Self rule doesn't shadow a CIDR rule (different source types)."""
-        data = {
-            'account_id': '100000000001',
-            'security_groups': {
-                'my-sg': {
-                    'description': 'test',
-                    'ingress': [
-                        {'protocol': 'tcp', 'from_port': 443, 'to_port': 443, 'self': True},
-                        {'protocol': 'tcp', 'from_port': 443, 'to_port': 443, 'cidr_blocks': ['10.0.0.0/24']},
-                    ],
-                },
-            },
-        }
-        summary = _validate(repo_root, '100000000001', data)
-        shadow_warnings = [w for w in summary.warnings if w.rule == 'rule_shadowed']
+        data = _make_data(
+            ingress=[
+                {'protocol': 'tcp', 'from_port': 443, 'to_port': 443, 'self': True},
+                {'protocol': 'tcp', 'from_port': 443, 'to_port': 443, 'cidr_blocks': ['10.0.0.0/24']},
+            ],
+        )
+        summary = compiled_validator(ACCOUNT_ID, data)
+        shadow_warnings = summary.warnings_by_rule.get('rule_shadowed', [])
         assert len(shadow_warnings) == 0
 
-    def test_egress_shadowing(self, repo_root):
+    def test_egress_shadowing(self, compiled_validator):
         """Shadowing detection works for egress rules too."""
-        data = {
-            'account_id': '100000000001',
-            'security_groups': {
-                'my-sg': {
-                    'description': 'test',
-                    'egress': [
-                        {'protocol': 'tcp', 'from_port': 400, 'to_port': 500, 'cidr_blocks': ['10.0.0.0/8']},
-                        {'protocol': 'tcp', 'from_port': 443, 'to_port': 443, 'cidr_blocks': ['10.1.2.0/24']},
-                    ],
-                },
-            },
-        }
-        summary = _validate(repo_root, '100000000001', data)
-        shadow_warnings = [w for w in summary.warnings if w.rule == 'rule_shadowed']
+        data = _make_data(
+            egress=[
+                {'protocol': 'tcp', 'from_port': 400, 'to_port': 500, 'cidr_blocks': ['10.0.0.0/8']},
+                {'protocol': 'tcp', 'from_port': 443, 'to_port': 443, 'cidr_blocks': ['10.1.2.0/24']},
+            ],
+        )
+        summary = compiled_validator(ACCOUNT_ID, data)
+        shadow_warnings = summary.warnings_by_rule.get('rule_shadowed', [])
         assert len(shadow_warnings) == 1
 
 
 class TestTagEnvMismatch:
-    def test_app_env_tag_matches_environment(self, repo_root_with_tags):
+    def test_app_env_tag_matches_environment(self, tagged_validator):
         """No error when <company>-app-env matches top-level environment."""
         data = {
-            'account_id': '100000000001',
+            'account_id': ACCOUNT_ID,
             'environment': 'prod',
             'security_groups': {
                 'my-sg': {
@@ -987,14 +878,14 @@ class TestTagEnvMismatch:
                 },
             },
         }
-        summary = _validate(repo_root_with_tags, '100000000001', data)
-        mismatch_errors = [e for e in summary.errors if e.rule == 'sg_tag_env_mismatch']
+        summary = tagged_validator(ACCOUNT_ID, data)
+        mismatch_errors = summary.errors_by_rule.get('sg_tag_env_mismatch', [])
         assert len(mismatch_errors) == 0
 
-    def test_app_env_tag_mismatch_gives_error(self, repo_root_with_tags):
+    def test_app_env_tag_mismatch_gives_error(self, tagged_validator):
         """Error when <company>-app-env doesn't match top-level environment."""
         data = {
-            'account_id': '100000000001',
+            'account_id': ACCOUNT_ID,
             'environment': 'prod',
             'security_groups': {
                 'my-sg': {
@@ -1013,8 +904,112 @@ class TestTagEnvMismatch:
                 },
             },
         }
-        summary = _validate(repo_root_with_tags, '100000000001', data)
-        mismatch_errors = [e for e in summary.errors if e.rule == 'sg_tag_env_mismatch']
+        summary = tagged_validator(ACCOUNT_ID, data)
+        mismatch_errors = summary.errors_by_rule.get('sg_tag_env_mismatch', [])
         assert len(mismatch_errors) == 1
         assert "dev" in mismatch_errors[0].message
         assert "prod" in mismatch_errors[0].message
+
+
+# ============================================================
+# Command-line parsing
+# ============================================================
+
+class TestParseArgs:
+    def test_fast_path_matches_argparse_defaults(self):
+        fast = _parse_args(['accounts/100000000001'])
+        full = _build_parser().parse_args(['accounts/100000000001'])
+        assert vars(fast) == vars(full)
+
+    def test_flags_use_argparse(self):
+        args = _parse_args(['accounts/100000000001', '--format', 'json', '-v'])
+        assert args.format == 'json'
+        assert args.verbose is True
+
+    def test_multiple_account_dirs(self):
+        args = _parse_args(['accounts/100000000001', 'accounts/100000000002'])
+        assert args.account_dirs == ['accounts/100000000001', 'accounts/100000000002']
+
+
+class TestRunAccount:
+    def test_json_report_and_missing_dir(self, repo_root):
+        account_dir = _write_sg_yaml(repo_root, ACCOUNT_ID, {
+            'account_id': ACCOUNT_ID,
+            'security_groups': {},
+        })
+        args = _parse_args([account_dir, '--format', 'json'])
+        report, error, exit_code = _run_account(args, account_dir)
+        assert error is None
+        assert report['account_id'] == ACCOUNT_ID
+        assert 'info' not in report['validation_results']
+        assert exit_code == 0
+
+        report, error, exit_code = _run_account(args, os.path.join(repo_root, 'missing'))
+        assert report is None
+        assert error.startswith('Account directory not found')
+        assert exit_code == 1
+
+    def test_discover_account_dirs(self, fresh_repo_root):
+        repo_root = fresh_repo_root
+        _write_sg_yaml(repo_root, '100000000002', {'account_id': '100000000002', 'security_groups': {}})
+        _write_sg_yaml(repo_root, ACCOUNT_ID, {'account_id': ACCOUNT_ID, 'security_groups': {}})
+        _write_sg_yaml(repo_root, '_example', {'account_id': '100000000003', 'security_groups': {}})
+        os.makedirs(os.path.join(repo_root, 'accounts', '100000000004'))  # no YAML
+        accounts_root = os.path.join(repo_root, 'accounts')
+        assert _discover_account_dirs(accounts_root) == [
+            os.path.join(accounts_root, ACCOUNT_ID),
+            os.path.join(accounts_root, '100000000002'),
+        ]
+
+    def test_batch_crash_fails_only_that_account(self, fresh_repo_root, monkeypatch, capsys):
+        accounts_root = os.path.join(fresh_repo_root, 'accounts')
+        good = _write_sg_yaml(fresh_repo_root, ACCOUNT_ID, {'account_id': ACCOUNT_ID, 'security_groups': {}})
+        bad = _write_sg_yaml(fresh_repo_root, '100000000002', {'account_id': '100000000002', 'security_groups': {}})
+        validate_account = SecurityGroupValidator.validate
+
+        def crash_on_bad(self):
+            if str(self.account_dir).endswith('100000000002'):
+                raise AttributeError('boom')
+            return validate_account(self)
+
+        monkeypatch.setattr(SecurityGroupValidator, 'validate', crash_on_bad)
+        monkeypatch.setattr(sys, 'argv', ['validate.py', '--accounts-root', accounts_root, '-j', '1', '--format', 'json'])
+        with pytest.raises(SystemExit) as exc:
+            main()
+        assert exc.value.code == 1
+        payloads = json.loads(capsys.readouterr().out)
+        assert payloads[0]['account_id'] == ACCOUNT_ID
+        assert payloads[0]['account_dir'] == good
+        assert payloads[1] == {'account_dir': bad, 'error': 'Unexpected AttributeError: boom'}
+
+    def test_quiet_prints_nothing_for_missing_dir(self, repo_root, monkeypatch, capsys):
+        monkeypatch.setattr(sys, 'argv', ['validate.py', os.path.join(repo_root, 'missing'), '--quiet'])
+        with pytest.raises(SystemExit) as exc:
+            main()
+        assert exc.value.code == 1
+        assert capsys.readouterr() == ('', '')
+
+    @pytest.mark.parametrize('indent', [True, False])
+    def test_write_json_same_with_and_without_orjson(self, compiled_validator, monkeypatch, capsysbinary, indent):
+        import validate
+        if validate.orjson is None:
+            pytest.skip('orjson not installed')
+        # The unicode_character error message quotes the character and includes an em dash
+        summary = compiled_validator(ACCOUNT_ID, _make_data(ingress=[
+            {**_BASE_RULE_TCP_443, 'description': 'caf\u00e9'}]))
+        payload = [{'account_id': ACCOUNT_ID, 'errors': summary.errors, 'warnings': []}]
+        _write_json(payload, indent=indent)
+        with_orjson = capsysbinary.readouterr().out
+        monkeypatch.setattr(validate, 'orjson', None)
+        _write_json(payload, indent=indent)
+        assert capsysbinary.readouterr().out == with_orjson
+
+    def test_combined_exit_code(self):
+        assert _combine_exit_codes([0, 0]) == 0
+        assert _combine_exit_codes([0, 2]) == 2
+        assert _combine_exit_codes([2, 1, 0]) == 1
+
+    def test_ascii_output(self):
+        assert _to_ascii("⚠️  Warnings:") == "[!]  Warnings:"
+        assert _to_ascii("❌ Port 23 — blocked.\n   → Remove") == "[x] Port 23 - blocked.\n   -> Remove"
+        assert _to_ascii("café") == "caf?"